@@ -1,6 +1,7 @@
+import copy
 import os
-import yaml
 from pathlib import Path
+from .utils.config import load_yaml_cached
 
 DEFAULT_CONFIG = {
     'api_keys': {
@@ -20,15 +21,24 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Parsed config, kept for the life of the process
+_CONFIG_CACHE = None
+
 def load_config():
-    """Load configuration from config.yaml"""
+    """Load configuration from config.yaml; each call returns its own copy"""
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is not None:
+        # Callers may mutate their config, so never hand out the cached dict itself
+        return copy.deepcopy(_CONFIG_CACHE)
+    
     config_path = Path('config/config.yaml')
     
     if not config_path.exists():
+        import yaml
         os.makedirs(config_path.parent, exist_ok=True)
         with open(config_path, 'w') as f:
             yaml.dump(DEFAULT_CONFIG, f)
-        return DEFAULT_CONFIG
-    
-    with open(config_path) as f:
-        return yaml.safe_load(f) 
\ No newline at end of file
+        _CONFIG_CACHE = copy.deepcopy(DEFAULT_CONFIG)
+    else:
+        _CONFIG_CACHE = load_yaml_cached(config_path)
+    return copy.deepcopy(_CONFIG_CACHE)
@@ -30,6 +30,7 @@ class Framework:
     def __init__(self, args):
         self.args = args
         self.target = args.domain
+        self.no_cache = getattr(args, 'no_cache', False)
         self.config = ConfigManager()
         self.logger = logging.getLogger(__name__)
         
@@ -10,6 +10,7 @@ from concurrent.futures import ThreadPoolExecutor
 import subprocess
 from datetime import datetime
 from core.utils.event_bus import EventBus
+from core.utils.tool_checker import tool_path
 import re
 
 class ToolExecutionError(Exception):
@@ -206,7 +207,7 @@ class BaseModule(ABC):
 		pass
 
 	@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-	async def execute_tool(self, cmd: List[str], timeout: Optional[int] = None) -> ToolResult:
+	async def execute_tool(self, cmd: List[str], timeout: Optional[int] = None, input_data: Optional[str] = None) -> ToolResult:
 		"""Execute a tool with retry logic and proper error handling"""
 		start_time = datetime.now()
 		try:
@@ -219,17 +220,19 @@ class BaseModule(ABC):
 
 			process = await asyncio.create_subprocess_exec(
 				*cmd,
+				stdin=asyncio.subprocess.PIPE if input_data is not None else None,
 				stdout=asyncio.subprocess.PIPE,
 				stderr=asyncio.subprocess.PIPE
 			)
 
 			try:
 				stdout, stderr = await asyncio.wait_for(
-					process.communicate(),
+					process.communicate(input_data.encode() if input_data is not None else None),
 					timeout=timeout or self.config.tools.timeout
 				)
 			except asyncio.TimeoutError:
 				process.kill()
+				await process.wait()
 				return ToolResult(
 					success=False,
 					error=f"Tool {cmd[0]} execution timed out",
@@ -254,14 +257,7 @@ class BaseModule(ABC):
 	async def _check_tool_exists(self, tool_name: str) -> bool:
 		"""Check if a tool is installed"""
 		try:
-			process = await asyncio.create_subprocess_exec(
-				'which',
-				tool_name,
-				stdout=asyncio.subprocess.PIPE,
-				stderr=asyncio.subprocess.PIPE
-			)
-			stdout, stderr = await process.communicate()
-			return process.returncode == 0 and bool(stdout)
+			return tool_path(tool_name) is not None
 		except Exception as e:
 			self.logger.error(f"Error checking tool {tool_name}: {e}")
 			return False
@@ -15,6 +15,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..utils.rate_limiter import RateLimiter
 from ..utils.cache_manager import CacheManager
 
+_SCHEMES = ('http://', 'https://')
+
 @dataclass
 class DiscoveryResult:
     tool: str
@@ -512,15 +514,19 @@ class DiscoveryModule(BaseModule):
         combined_targets = self.session.get_processed_path('discovery', 'combined_targets.txt')
         with open(combined_targets, 'w') as f:
             # Write all subdomains with http/https prefix
+            seen = set()
             for subdomain in sorted(processed_results['subdomains']):
-                f.write(f"http://{subdomain}\n")
-                f.write(f"https://{subdomain}\n")
+                for scheme in _SCHEMES:
+                    seen.add(scheme + subdomain)
+                    f.write(scheme + subdomain + "\n")
             
-            # Write all URLs that were discovered
+            # Write all URLs that were discovered, skipping ones already covered above
             for url in sorted(processed_results['urls']):
-                if not url.startswith('http'):
-                    url = f"https://{url}"
-                f.write(f"{url}\n")
+                if not url.startswith(_SCHEMES):
+                    url = 'https://' + url
+                if url not in seen:
+                    seen.add(url)
+                    f.write(url + "\n")
         
         self.logger.info(f"Created combined targets file for web probing: {combined_targets}")
         return combined_targets
@@ -1,31 +1,15 @@
-from typing import Dict, Any, List, Optional, Set, Type
+from typing import Dict, Any, List, Optional, Type
 from pathlib import Path
-import json
 import asyncio
-import aiofiles
-from datetime import datetime, timedelta
-import aiohttp
 import aiodns
-from cachetools import TTLCache
-import re
-from dataclasses import dataclass, field
 from ..utils.rate_limiter import RateLimiter
 from ..utils.cache_manager import CacheManager
+from ..utils.ndjson import iter_ndjson, loads_ndjson
 from .base_module import BaseModule, ToolResult
 import shutil
 import tempfile
 import os
 
-@dataclass
-class DNSResult:
-    tool: str
-    raw_output: Optional[Path] = None
-    records: List[Dict[str, Any]] = field(default_factory=list)
-    error: Optional[str] = None
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-    duration: float = 0.0
-    success_rate: float = 0.0
-
 class DNSAnalysisModule(BaseModule):
     # Define module dependencies
     dependencies = ['discovery']
@@ -38,8 +22,6 @@ class DNSAnalysisModule(BaseModule):
             'dnsgen': self._run_dnsgen,
             'massdns': self._run_massdns
         }
-        self.running_tasks: Set[asyncio.Task] = set()
-        self.max_concurrent_tasks = self.config.tools.threads
         self.rate_limiter = RateLimiter(
             calls_per_second=self.config.tools.rate_limit,
             burst_size=self.config.tools.burst_size
@@ -48,8 +30,38 @@ class DNSAnalysisModule(BaseModule):
             cache_dir=self.output_dir / 'cache',
             ttl=self.config.performance.cache_ttl
         )
-        self.resolver = aiodns.DNSResolver()
-        self.session = None
+        self.resolver = None
+        # Resolve wordlist locations once instead of stat-ing them per call
+        self._paths: Dict[str, Optional[Path]] = {
+            'dnsx_wordlist': self._find_file(
+                '/usr/share/wordlists/dns.txt',
+                '/usr/share/wordlists/subdomains.txt'
+            ),
+            'altdns_wordlist': self._find_file(
+                '/usr/share/wordlists/altdns.txt',
+                '/usr/share/wordlists/words.txt'
+            ),
+            'resolvers': self._find_file('/usr/share/wordlists/resolvers.txt')
+        }
+
+    @staticmethod
+    def _find_file(*candidates: str) -> Optional[Path]:
+        """Return the first candidate path that is an existing file"""
+        for candidate in candidates:
+            path = Path(candidate)
+            if path.is_file():
+                return path
+        return None
+
+    def _default_file(self, key: str, filename: str, content: str) -> Path:
+        """Get a resolved path, writing a minimal default file once if none was found"""
+        path = self._paths.get(key)
+        if path is None:
+            path = self.output_dir / 'defaults' / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+            self._paths[key] = path
+        return path
 
     async def setup(self) -> None:
         """Setup module resources"""
@@ -126,23 +138,23 @@ class DNSAnalysisModule(BaseModule):
                     self.logger.warning("No targets found for DNS analysis")
                     return results
                 
+                # Run dnsx once across all targets; it fans out internally
+                dnsx_results = await self._run_dnsx(targets)
+                if dnsx_results and isinstance(dnsx_results, dict):
+                    results["dns_records"].extend(dnsx_results.get("records", []))
+                    results["errors"].extend(dnsx_results.get("errors", []))
+                
+                # Permutation tools work from the whole known subdomain list
+                altdns_results = await self._run_altdns(targets)
+                if altdns_results and isinstance(altdns_results, dict):
+                    results["dns_records"].extend(altdns_results.get("records", []))
+                
+                dnsgen_results = await self._run_dnsgen(targets)
+                if dnsgen_results and isinstance(dnsgen_results, dict):
+                    results["dns_records"].extend(dnsgen_results.get("records", []))
+                
                 for target in targets:
                     try:
-                        # Run dnsx
-                        dnsx_results = await self._run_dnsx(target)
-                        if dnsx_results and isinstance(dnsx_results, dict):
-                            results["dns_records"].extend(dnsx_results.get("records", []))
-                        
-                        # Run altdns
-                        altdns_results = await self._run_altdns(target)
-                        if altdns_results and isinstance(altdns_results, dict):
-                            results["dns_records"].extend(altdns_results.get("records", []))
-                        
-                        # Run dnsgen
-                        dnsgen_results = await self._run_dnsgen(target)
-                        if dnsgen_results and isinstance(dnsgen_results, dict):
-                            results["dns_records"].extend(dnsgen_results.get("records", []))
-                        
                         # Run massdns
                         massdns_results = await self._run_massdns(target)
                         if massdns_results and isinstance(massdns_results, dict):
@@ -169,6 +181,21 @@ class DNSAnalysisModule(BaseModule):
 
     async def _get_targets(self) -> List[str]:
         try:
+            # Key the parsed target list on the results file's mtime and size
+            # so it is only rebuilt when discovery writes new results
+            cache_key = None
+            results_file = self.framework.session_manager.get_processed_path(
+                "discovery", "discovery_results.json"
+            )
+            try:
+                stat = results_file.stat()
+                cache_key = f"discovery:{stat.st_mtime_ns}:{stat.st_size}"
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return list(cached)
+            except FileNotFoundError:
+                pass
+
             results = await self.framework.session_manager.get_results("discovery")
             if not results:
                 self.logger.warning("No discovery results found, using target domain")
@@ -183,79 +210,94 @@ class DNSAnalysisModule(BaseModule):
             
             if not targets:
                 self.logger.warning("No valid targets found in discovery results, using target domain")
-                targets = [self.framework.target]
+                return [self.framework.target]
             
+            targets = list(dict.fromkeys(targets))
+            if cache_key:
+                self.cache.set(cache_key, targets)
             return targets
         except Exception as e:
             self.logger.error(f"Error getting targets: {str(e)}")
             return [self.framework.target]
 
-    async def _run_dnsx(self, target: str) -> Dict[str, Any]:
+    async def _run_dnsx(self, targets: List[str]) -> Dict[str, Any]:
         try:
-            # Use a default wordlist if available
-            wordlist = "/usr/share/wordlists/dns.txt"
-            if not os.path.exists(wordlist):
-                wordlist = "/usr/share/wordlists/subdomains.txt"
-            if not os.path.exists(wordlist):
+            wordlist = self._paths['dnsx_wordlist']
+            if wordlist is None:
                 self.logger.error("No suitable wordlist found for dnsx")
                 return {"records": [], "errors": ["No suitable wordlist found"]}
 
-            result = await self.execute_tool([
-                "dnsx",
-                "-d", target,
-                "-w", wordlist,
-                "-silent",
-                "-a",
-                "-aaaa",
-                "-cname",
-                "-mx",
-                "-ns",
-                "-txt",
-                "-json"
-            ])
+            # Split the targets into interleaved chunks so each dnsx process
+            # works through its own share of the list in parallel
+            chunk_count = max(1, min(8, os.cpu_count() or 1, len(targets)))
+            chunks = [targets[i::chunk_count] for i in range(chunk_count)]
+
+            temp_dir = self.output_dir / 'temp'
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+
+            async def run_chunk(index: int, chunk: List[str]) -> ToolResult:
+                chunk_file = temp_dir / f"dnsx_chunk{index}.txt"
+                chunk_file.write_text("\n".join(chunk) + "\n")
+                async with semaphore:
+                    await self.rate_limiter.acquire()
+                    return await self.execute_tool([
+                        "dnsx",
+                        "-d", str(chunk_file),
+                        "-w", str(wordlist),
+                        "-silent",
+                        "-a",
+                        "-aaaa",
+                        "-cname",
+                        "-mx",
+                        "-ns",
+                        "-txt",
+                        "-json"
+                    ])
+
+            chunk_results = await asyncio.gather(
+                *(run_chunk(i, chunk) for i, chunk in enumerate(chunks))
+            )
 
-            if not result.success:
-                self.logger.error(f"Dnsx failed: {result.error}")
-                return {"records": [], "errors": [result.error]}
-            
             records = []
-            if result.output:
-                for line in result.output.split("\n"):
-                    if line.strip():
-                        try:
-                            record = json.loads(line)
-                            records.append(record)
-                        except json.JSONDecodeError:
-                            continue
-                        
+            errors = []
+            for result in chunk_results:
+                if not result.success:
+                    self.logger.error(f"Dnsx failed: {result.error}")
+                    errors.append(result.error)
+                    continue
+                if result.output:
+                    records.extend(loads_ndjson(result.output))
+
+            if errors and not records:
+                return {"records": [], "errors": errors}
             return {"records": records}
         except Exception as e:
             self.logger.error(f"Error in dnsx: {str(e)}")
             return {"records": [], "errors": [str(e)]}
 
-    async def _run_altdns(self, target: str) -> Dict[str, Any]:
+    async def _run_altdns(self, targets: List[str]) -> Dict[str, Any]:
+        # Permutations of a lone target domain aren't worth a tool run
+        if len(targets) < 2:
+            return {"records": [], "skipped": "insufficient input"}
         try:
             # Create temporary files for input and output
             with tempfile.NamedTemporaryFile(mode='w', delete=False) as input_file:
-                input_file.write(target + "\n")
+                input_file.write("\n".join(targets) + "\n")
                 input_file_path = input_file.name
             
             output_file_path = input_file_path + ".out"
             
             # Use a default wordlist if available
-            wordlist = "/usr/share/wordlists/altdns.txt"
-            if not os.path.exists(wordlist):
-                wordlist = "/usr/share/wordlists/words.txt"
-            if not os.path.exists(wordlist):
-                # Create a minimal wordlist if none exists
-                wordlist = input_file_path + ".words"
-                with open(wordlist, 'w') as f:
-                    f.write("dev\nstaging\ntest\nprod\napi\nadmin\n")
+            wordlist = self._default_file(
+                'altdns_wordlist', 'altdns_words.txt',
+                "dev\nstaging\ntest\nprod\napi\nadmin\n"
+            )
             
             result = await self.execute_tool([
                 "altdns",
                 "-i", input_file_path,
-                "-w", wordlist,
+                "-w", str(wordlist),
                 "-o", output_file_path
             ])
 
@@ -276,7 +318,6 @@ class DNSAnalysisModule(BaseModule):
                 try:
                     os.unlink(input_file_path)
                     os.unlink(output_file_path)
-                    os.unlink(wordlist)
                 except:
                     pass
                 
@@ -285,28 +326,21 @@ class DNSAnalysisModule(BaseModule):
             self.logger.error(f"Error in altdns: {str(e)}")
             return {"records": [], "errors": [str(e)]}
 
-    async def _run_dnsgen(self, target: str) -> Dict[str, Any]:
+    async def _run_dnsgen(self, targets: List[str]) -> Dict[str, Any]:
+        # Permutations of a lone target domain aren't worth a tool run
+        if len(targets) < 2:
+            return {"records": [], "skipped": "insufficient input"}
         try:
-            # Create temporary file for input
-            with tempfile.NamedTemporaryFile(mode='w', delete=False) as input_file:
-                input_file.write(target + "\n")
-                input_file_path = input_file.name
-            
-            result = await self.execute_tool(["dnsgen", input_file_path])
+            # dnsgen reads its input from stdin when given "-"
+            result = await self.execute_tool(["dnsgen", "-"], input_data="\n".join(targets) + "\n")
             if not result.success:
                 self.logger.error(f"Dnsgen failed: {result.error}")
                 return {"records": [], "errors": [result.error]}
             
             records = []
             if result.output:
-                for line in result.output.split("\n"):
-                    if line.strip():
-                        records.append({"domain": line.strip(), "type": "dnsgen"})
-                    
-            try:
-                os.unlink(input_file_path)
-            except:
-                pass
+                for line in iter_ndjson(result.output):
+                    records.append({"domain": line, "type": "dnsgen"})
                     
             return {"records": records}
         except Exception as e:
@@ -321,16 +355,14 @@ class DNSAnalysisModule(BaseModule):
                 input_file_path = input_file.name
             
             # Use a default resolver list if available
-            resolver_list = "/usr/share/wordlists/resolvers.txt"
-            if not os.path.exists(resolver_list):
-                # Create a minimal resolver list if none exists
-                resolver_list = input_file_path + ".resolvers"
-                with open(resolver_list, 'w') as f:
-                    f.write("8.8.8.8\n8.8.4.4\n1.1.1.1\n1.0.0.1\n")
+            resolver_list = self._default_file(
+                'resolvers', 'resolvers.txt',
+                "8.8.8.8\n8.8.4.4\n1.1.1.1\n1.0.0.1\n"
+            )
             
             result = await self.execute_tool([
                 "massdns",
-                "-r", resolver_list,
+                "-r", str(resolver_list),
                 "-t", "A",
                 "-o", "J",
                 input_file_path
@@ -340,20 +372,10 @@ class DNSAnalysisModule(BaseModule):
                 self.logger.error(f"Massdns failed: {result.error}")
                 return {"records": [], "errors": [result.error]}
             
-            records = []
-            if result.output:
-                for line in result.output.split("\n"):
-                    if line.strip():
-                        try:
-                            record = json.loads(line)
-                            records.append(record)
-                        except json.JSONDecodeError:
-                            continue
+            records = loads_ndjson(result.output) if result.output else []
                         
             try:
                 os.unlink(input_file_path)
-                if resolver_list.endswith(".resolvers"):
-                    os.unlink(resolver_list)
             except:
                 pass
                     
@@ -1,6 +1,7 @@
 from typing import Dict, Any, List, Optional, Type
 from pathlib import Path
 import json
+import orjson
 from .base_module import BaseModule, ToolResult
 import asyncio
 from dataclasses import dataclass
@@ -10,6 +11,15 @@ import shutil
 from datetime import datetime
 from core.utils.rate_limiter import RateLimiter
 from core.utils.cache_manager import CacheManager
+from core.utils.tools import run_tool
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+# Host count above which bloom_dedupe swaps the exact set for a Bloom filter
+BLOOM_DEDUPE_THRESHOLD = 100_000
 
 @dataclass
 class VulnScanResult:
@@ -502,7 +512,7 @@ exit
                     '-o', output_file
                 ]
                 
-                subprocess.run(cmd, check=True)
+                run_tool(cmd)
                 
                 if os.path.exists(output_file):
                     with open(output_file) as f:
@@ -526,12 +536,30 @@ exit
             return [f"http://{self.framework.args.domain}"]
             
         try:
-            data = json.loads(probing_file.read_text())
-            targets = []
-            for tool_results in data.values():
-                if isinstance(tool_results, dict) and 'live_hosts' in tool_results:
-                    targets.extend(tool_results['live_hosts'])
-            return list(set(targets)) if targets else [f"http://{self.framework.args.domain}"]
+            data = orjson.loads(probing_file.read_bytes())
+            host_lists = [
+                tool_results['live_hosts'] for tool_results in data.values()
+                if isinstance(tool_results, dict) and 'live_hosts' in tool_results
+            ]
+            
+            if (ScalableBloomFilter is not None
+                    and getattr(self.config.performance, 'bloom_dedupe', False)
+                    and sum(map(len, host_lists)) > BLOOM_DEDUPE_THRESHOLD):
+                # Approximate dedup; a rare false positive only drops a host that is
+                # very likely already present
+                seen = ScalableBloomFilter(initial_capacity=1_000_000, error_rate=0.01)
+                targets = []
+                for hosts in host_lists:
+                    for host in hosts:
+                        if host not in seen:
+                            seen.add(host)
+                            targets.append(host)
+                return targets or [f"http://{self.framework.args.domain}"]
+            
+            seen = set()
+            for hosts in host_lists:
+                seen.update(hosts)
+            return list(seen) or [f"http://{self.framework.args.domain}"]
         except Exception as e:
             self.logger.error(f"Error reading web probing results: {e}")
             return [f"http://{self.framework.args.domain}"]
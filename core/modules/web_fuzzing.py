@@ -1,26 +1,151 @@
-from typing import Dict, Any, List, Optional, Set, Type
+from typing import Dict, Any, List, Optional, Tuple, Type, Callable
 from pathlib import Path
-import json
+from dataclasses import dataclass
+from functools import partial
 import asyncio
 import aiofiles
+import orjson
+import os
 import shutil
 from datetime import datetime
 from .base_module import BaseModule, ToolResult
 from core.utils.rate_limiter import RateLimiter
 from core.utils.cache_manager import CacheManager
+from core.utils.ndjson import iter_ndjson
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """How to invoke a fuzzing tool and parse what it writes"""
+    build_cmd: Callable[[str, str, Any], List[str]]
+    # Optional template taking a targets list file instead of a single target
+    build_batch_cmd: Optional[Callable[[str, str, Any], List[str]]] = None
+    parse: Callable[[bytes], Any] = orjson.loads
+    version_args: Tuple[str, ...] = ('--version',)
+
+def _parse_lines(data: bytes) -> Dict[str, Any]:
+    """Parse plain line-per-path output such as gobuster's"""
+    return {'directories': [line.decode() for line in iter_ndjson(data)]}
+
+# Command template for each tool, called with (target, output file, config)
+TOOL_SPECS: Dict[str, ToolSpec] = {
+    'dirsearch': ToolSpec(
+        build_cmd=lambda target, output, config: [
+            'dirsearch',
+            '--url', target,
+            '--wordlist', str(config.wordlists.content),
+            '--format', 'json',
+            '--output', output,
+            '--random-agent',
+            '--threads', str(config.tools.threads),
+            '--timeout', str(config.tools.timeout),
+            '--recursion-depth', '2'
+        ],
+        build_batch_cmd=lambda targets_file, output, config: [
+            'dirsearch',
+            '--url-file', targets_file,
+            '--wordlist', str(config.wordlists.content),
+            '--format', 'json',
+            '--output', output,
+            '--random-agent',
+            '--threads', str(config.tools.threads),
+            '--timeout', str(config.tools.timeout),
+            '--recursion-depth', '2'
+        ]
+    ),
+    'gobuster': ToolSpec(
+        build_cmd=lambda target, output, config: [
+            'gobuster',
+            'dir',
+            '--url', target,
+            '--wordlist', str(config.wordlists.content),
+            '--output', output,
+            '--threads', str(config.tools.threads),
+            '--timeout', str(config.tools.timeout) + 's',
+            '--no-error',
+            '--quiet'
+        ],
+        parse=_parse_lines,
+        version_args=('version',)
+    ),
+    'ffuf': ToolSpec(
+        build_cmd=lambda target, output, config: [
+            'ffuf',
+            '-u', target + '/FUZZ',
+            '-w', str(config.wordlists.content),
+            '-o', output,
+            '-of', 'json',
+            '-t', str(config.tools.threads),
+            '-timeout', str(config.tools.timeout),
+            '-s'
+        ],
+        build_batch_cmd=lambda targets_file, output, config: [
+            'ffuf',
+            '-u', 'HOST/FUZZ',
+            '-w', f'{targets_file}:HOST',
+            '-w', f'{config.wordlists.content}:FUZZ',
+            '-mode', 'clusterbomb',
+            '-o', output,
+            '-of', 'json',
+            '-t', str(config.tools.threads),
+            '-timeout', str(config.tools.timeout),
+            '-s'
+        ],
+        version_args=('-V',)
+    ),
+    'wfuzz': ToolSpec(
+        build_cmd=lambda target, output, config: [
+            'wfuzz',
+            '-w', str(config.wordlists.content),
+            '--hc', '404',
+            '-f', output,
+            '-o', 'json',
+            '-t', str(config.tools.threads),
+            '-Z',
+            target + '/FUZZ'
+        ],
+        build_batch_cmd=lambda targets_file, output, config: [
+            'wfuzz',
+            '-w', targets_file,
+            '-w', str(config.wordlists.content),
+            '--hc', '404',
+            '-f', output,
+            '-o', 'json',
+            '-t', str(config.tools.threads),
+            '-Z',
+            'FUZZ/FUZ2Z'
+        ]
+    ),
+    'katana': ToolSpec(
+        build_cmd=lambda target, output, config: [
+            'katana',
+            '-u', target,
+            '-jc',
+            '-o', output,
+            '-c', str(config.tools.threads),
+            '-timeout', str(config.tools.timeout),
+            '-silent'
+        ],
+        build_batch_cmd=lambda targets_file, output, config: [
+            'katana',
+            '-list', targets_file,
+            '-jc',
+            '-o', output,
+            '-c', str(config.tools.threads),
+            '-timeout', str(config.tools.timeout),
+            '-silent'
+        ],
+        version_args=('-version',)
+    )
+}
+_VERSION_CACHE_FILE = Path.home() / '.cache' / 'lleo' / 'tool_versions.json'
+# Targets per batched run, which keeps each batch's timeout to a fixed multiple
+# of tools.per_target_timeout however many targets there are
+_BATCH_SIZE = 8
 
 class WebFuzzingModule(BaseModule):
     def __init__(self, framework):
         super().__init__(framework)
-        self.tools = {
-            'dirsearch': self._run_dirsearch,
-            'gobuster': self._run_gobuster,
-            'ffuf': self._run_ffuf,
-            'wfuzz': self._run_wfuzz,
-            'katana': self._run_katana
-        }
-        self.running_tasks: Set[asyncio.Task] = set()
-        self.max_concurrent_tasks = self.config.tools.threads
+        self.tools = {name: partial(self._run_tool, name) for name in TOOL_SPECS}
         self.rate_limiter = RateLimiter(
             calls_per_second=self.config.tools.rate_limit,
             burst_size=self.config.tools.burst_size
@@ -29,38 +154,21 @@ class WebFuzzingModule(BaseModule):
             cache_dir=self.output_dir / 'cache',
             ttl=self.config.performance.cache_ttl
         )
+        # Stamped once per module instance so every file from a run shares it
+        self._run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._safe_names: Dict[str, str] = {}
+        self._shards: Dict[str, Dict[str, str]] = {}
+        # Optional behaviour, switched on under modules.web_fuzzing in the config
+        self.module_options: Dict[str, Any] = self.config.modules.get('web_fuzzing') or {}
 
     async def setup(self) -> None:
         """Setup module resources"""
         await super().setup()
         self.logger.info("Setting up web fuzzing module...")
+        self._shards = {}
         
         # Verify tool versions
-        for tool, min_version in self.get_required_tools().items():
-            try:
-                if tool == 'dirsearch':
-                    result = await self.execute_tool(['dirsearch', '--version'])
-                elif tool == 'gobuster':
-                    result = await self.execute_tool(['gobuster', 'version'])
-                elif tool == 'ffuf':
-                    result = await self.execute_tool(['ffuf', '-V'])
-                elif tool == 'wfuzz':
-                    result = await self.execute_tool(['wfuzz', '--version'])
-                elif tool == 'katana':
-                    result = await self.execute_tool(['katana', '-version'])
-                else:
-                    result = await self.execute_tool([tool, '--version'])
-                    
-                if result.success:
-                    version = result.output
-                    if version:
-                        self.logger.info(f"Found {tool} version {version}")
-                    else:
-                        self.logger.warning(f"Could not determine {tool} version")
-                else:
-                    self.logger.error(f"Error checking {tool} version: {result.error}")
-            except Exception as e:
-                self.logger.error(f"Error checking {tool} version: {e}")
+        await self._check_tool_versions()
 
         # Create necessary directories
         for dir_name in ['raw', 'processed', 'temp']:
@@ -70,6 +178,49 @@ class WebFuzzingModule(BaseModule):
         # Initialize rate limiter monitoring
         await self.rate_limiter.start_monitoring()
 
+    async def _check_tool_versions(self) -> None:
+        """Log installed tool versions, only running binaries that changed since the last check"""
+        try:
+            cache = orjson.loads(_VERSION_CACHE_FILE.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            cache = {}
+
+        # Key each tool on its resolved path and mtime so upgrades are re-checked
+        keys = {}
+        for tool in self.get_required_tools():
+            path = shutil.which(tool)
+            if path is None:
+                self.logger.error(f"Error checking {tool} version: {tool} not found")
+                continue
+            keys[tool] = f"{path}:{os.stat(path).st_mtime_ns}"
+
+        pending = [tool for tool, key in keys.items() if key not in cache]
+        results = await asyncio.gather(
+            *(self.execute_tool([tool, *TOOL_SPECS[tool].version_args]) for tool in pending),
+            return_exceptions=True
+        )
+        for tool, result in zip(pending, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error checking {tool} version: {result}")
+            elif not result.success:
+                self.logger.error(f"Error checking {tool} version: {result.error}")
+            else:
+                cache[keys[tool]] = result.output
+
+        for tool, key in keys.items():
+            version = cache.get(key)
+            if version:
+                self.logger.info(f"Found {tool} version {version}")
+            elif key in cache:
+                self.logger.warning(f"Could not determine {tool} version")
+
+        if pending:
+            try:
+                _VERSION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                _VERSION_CACHE_FILE.write_bytes(orjson.dumps(cache))
+            except OSError as e:
+                self.logger.debug(f"Could not persist tool version cache: {e}")
+
     async def cleanup(self) -> None:
         """Cleanup module resources"""
         try:
@@ -132,47 +283,59 @@ class WebFuzzingModule(BaseModule):
             
             targets = await self._get_targets()
             
-            for target in targets:
-                try:
-                    self.logger.info(f"Running dirsearch on {target}")
-                    dirsearch_results = await self._run_dirsearch(target)
-                    if dirsearch_results:
-                        results['directories'].extend(dirsearch_results.get('directories', []))
-                        results['files'].extend(dirsearch_results.get('files', []))
-                        results['endpoints'].extend(dirsearch_results.get('endpoints', []))
-                
-                    self.logger.info(f"Running gobuster on {target}")
-                    gobuster_results = await self._run_gobuster(target)
-                    if gobuster_results:
-                        results['directories'].extend(gobuster_results.get('directories', []))
-                        results['files'].extend(gobuster_results.get('files', []))
-                        results['endpoints'].extend(gobuster_results.get('endpoints', []))
-                
-                    self.logger.info(f"Running ffuf on {target}")
-                    ffuf_results = await self._run_ffuf(target)
-                    if ffuf_results:
-                        results['directories'].extend(ffuf_results.get('directories', []))
-                        results['files'].extend(ffuf_results.get('files', []))
-                        results['endpoints'].extend(ffuf_results.get('endpoints', []))
-                
-                    self.logger.info(f"Running wfuzz on {target}")
-                    wfuzz_results = await self._run_wfuzz(target)
-                    if wfuzz_results:
-                        results['directories'].extend(wfuzz_results.get('directories', []))
-                        results['files'].extend(wfuzz_results.get('files', []))
-                        results['endpoints'].extend(wfuzz_results.get('endpoints', []))
-                
-                    self.logger.info(f"Running katana on {target}")
-                    katana_results = await self._run_katana(target)
-                    if katana_results:
-                        results['directories'].extend(katana_results.get('directories', []))
-                        results['files'].extend(katana_results.get('files', []))
-                        results['endpoints'].extend(katana_results.get('endpoints', []))
-                
-                except Exception as e:
-                    error_msg = f"Error in fuzzing {target}: {str(e)}"
+            # With batch_targets on, tools that accept a list file get one run per
+            # batch of targets (gobuster's dir mode has no list option). Batched
+            # results are filed under the batch label rather than per target, so
+            # this is opt-in
+            batches = []
+            batch_size = _BATCH_SIZE if self.module_options.get('batch_targets', False) else 1
+            for i in range(0, len(targets), batch_size):
+                chunk = targets[i:i + batch_size]
+                if len(chunk) > 1:
+                    label = f'batch{len(batches)}'
+                    batch_file = self.output_dir / 'temp' / f'targets_{label}.txt'
+                    batch_file.write_text("\n".join(chunk) + "\n")
+                    batches.append((label, batch_file, chunk))
+            batched = {target for _, _, chunk in batches for target in chunk}
+            
+            jobs = []
+            for tool, spec in TOOL_SPECS.items():
+                single = targets
+                if spec.build_batch_cmd:
+                    jobs.extend(
+                        (f"{len(chunk)} targets", tool, partial(self._run_tool_batch, tool, batch_file, len(chunk), label))
+                        for label, batch_file, chunk in batches
+                    )
+                    single = [target for target in targets if target not in batched]
+                jobs.extend((target, tool, partial(self.tools[tool], target)) for target in single)
+            
+            # Fan every job out at once, bounded by the thread budget
+            semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+            
+            async def run_job(label: str, tool: str, job: Callable) -> Dict[str, Any]:
+                async with semaphore:
+                    await self.rate_limiter.acquire()
+                    self.logger.info(f"Running {tool} on {label}")
+                    return await job()
+            
+            tool_results = await asyncio.gather(
+                *(run_job(label, tool, job) for label, tool, job in jobs),
+                return_exceptions=True
+            )
+            
+            for (label, tool, _), tool_result in zip(jobs, tool_results):
+                if isinstance(tool_result, Exception):
+                    error_msg = f"Error in fuzzing {label} with {tool}: {str(tool_result)}"
                     self.logger.error(error_msg)
                     results['errors'].append(error_msg)
+                elif isinstance(tool_result, dict):
+                    results['directories'].extend(tool_result.get('directories', []))
+                    results['files'].extend(tool_result.get('files', []))
+                    results['endpoints'].extend(tool_result.get('endpoints', []))
+            
+            # Each tool's raw output already sits on disk as its own shard;
+            # record where instead of serialising every payload again
+            await self._write_index()
             
             # Remove duplicates while preserving order
             results['directories'] = list(dict.fromkeys(results['directories']))
@@ -187,6 +350,15 @@ class WebFuzzingModule(BaseModule):
         finally:
             await self.cleanup()
 
+    async def _write_index(self) -> None:
+        """Write the {target: {tool: raw output path}} index for this run"""
+        try:
+            index_file = self.output_dir / 'processed' / 'web_fuzzing_index.json'
+            async with aiofiles.open(index_file, 'wb') as f:
+                await f.write(orjson.dumps(self._shards, option=orjson.OPT_INDENT_2))
+        except Exception as e:
+            self.logger.error(f"Error writing web fuzzing index: {e}")
+
     async def _get_targets(self) -> List[str]:
         """Get targets from web probing results"""
         try:
@@ -209,158 +381,50 @@ class WebFuzzingModule(BaseModule):
             self.logger.error(f"Error getting targets: {str(e)}")
             return [f"http://{self.framework.target}"]
 
-    async def _run_dirsearch(self, target: str) -> Dict[str, Any]:
-        """Run dirsearch for directory enumeration"""
-        try:
-            output_file = self.output_dir / 'raw' / f'dirsearch_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cmd = [
-                'dirsearch',
-                '--url', target,
-                '--wordlist', str(self.config.wordlists.content),
-                '--format', 'json',
-                '--output', str(output_file),
-                '--random-agent',
-                '--threads', str(self.config.tools.threads),
-                '--timeout', str(self.config.tools.timeout),
-                '--recursion-depth', '2'
-            ]
-            
-            result = await self.execute_tool(cmd)
-            if not result.success:
-                return {'error': result.error}
-            
-            try:
-                if output_file.exists():
-                    with open(output_file) as f:
-                        return json.load(f)
-                return {'error': 'No output file generated'}
-            except Exception as e:
-                return {'error': f"Error processing dirsearch results: {e}"}
-        except Exception as e:
-            return {'error': f"Error in dirsearch: {e}"}
+    def _safe_name(self, target: str) -> str:
+        """Get a filesystem-safe name for a target, computed once per target"""
+        name = self._safe_names.get(target)
+        if name is None:
+            name = self._safe_names[target] = target.replace('://', '_').replace('/', '_')
+        return name
 
-    async def _run_gobuster(self, target: str) -> Dict[str, Any]:
-        """Run gobuster for directory enumeration"""
-        try:
-            output_file = self.output_dir / 'raw' / f'gobuster_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cmd = [
-                'gobuster',
-                'dir',
-                '--url', target,
-                '--wordlist', str(self.config.wordlists.content),
-                '--output', str(output_file),
-                '--threads', str(self.config.tools.threads),
-                '--timeout', str(self.config.tools.timeout) + 's',
-                '--no-error',
-                '--quiet'
-            ]
-            
-            result = await self.execute_tool(cmd)
-            if not result.success:
-                return {'error': result.error}
-            
-            try:
-                if output_file.exists():
-                    with open(output_file) as f:
-                        return {'directories': [line.strip() for line in f if line.strip()]}
-                return {'error': 'No output file generated'}
-            except Exception as e:
-                return {'error': f"Error processing gobuster results: {e}"}
-        except Exception as e:
-            return {'error': f"Error in gobuster: {e}"}
+    def _output_file(self, tool: str, label: str) -> Path:
+        """Get the raw output path for a tool run on a target within this run"""
+        return self.output_dir / 'raw' / f'{tool}_{label}_{self._run_id}.json'
 
-    async def _run_ffuf(self, target: str) -> Dict[str, Any]:
-        """Run ffuf for directory enumeration"""
-        try:
-            output_file = self.output_dir / 'raw' / f'ffuf_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cmd = [
-                'ffuf',
-                '-u', target + '/FUZZ',
-                '-w', str(self.config.wordlists.content),
-                '-o', str(output_file),
-                '-of', 'json',
-                '-t', str(self.config.tools.threads),
-                '-timeout', str(self.config.tools.timeout),
-                '-s'
-            ]
-            
-            result = await self.execute_tool(cmd)
-            if not result.success:
-                return {'error': result.error}
-            
-            try:
-                if output_file.exists():
-                    with open(output_file) as f:
-                        return json.load(f)
-                return {'error': 'No output file generated'}
-            except Exception as e:
-                return {'error': f"Error processing ffuf results: {e}"}
-        except Exception as e:
-            return {'error': f"Error in ffuf: {e}"}
+    async def _run_tool(self, name: str, target: str) -> Dict[str, Any]:
+        """Run a fuzzing tool from TOOL_SPECS against a target and parse its output"""
+        return await self._run_spec(
+            name, TOOL_SPECS[name].build_cmd, target, self._safe_name(target),
+            self.config.tools.per_target_timeout
+        )
 
-    async def _run_wfuzz(self, target: str) -> Dict[str, Any]:
-        """Run wfuzz for directory enumeration"""
-        try:
-            output_file = self.output_dir / 'raw' / f'wfuzz_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cmd = [
-                'wfuzz',
-                '-w', str(self.config.wordlists.content),
-                '--hc', '404',
-                '-f', str(output_file),
-                '-o', 'json',
-                '-t', str(self.config.tools.threads),
-                '-Z',
-                target + '/FUZZ'
-            ]
-            
-            result = await self.execute_tool(cmd)
-            if not result.success:
-                return {'error': result.error}
-            
-            try:
-                if output_file.exists():
-                    with open(output_file) as f:
-                        return json.load(f)
-                return {'error': 'No output file generated'}
-            except Exception as e:
-                return {'error': f"Error processing wfuzz results: {e}"}
-        except Exception as e:
-            return {'error': f"Error in wfuzz: {e}"}
+    async def _run_tool_batch(self, name: str, targets_file: Path, target_count: int, label: str) -> Dict[str, Any]:
+        """Run a fuzzing tool once over a batch of at most _BATCH_SIZE targets listed in targets_file"""
+        return await self._run_spec(
+            name, TOOL_SPECS[name].build_batch_cmd, str(targets_file), label,
+            self.config.tools.per_target_timeout * target_count
+        )
 
-    async def _run_katana(self, target: str) -> Dict[str, Any]:
-        """Run katana for crawling and directory enumeration"""
+    async def _run_spec(self, name: str, build_cmd: Callable, arg: str, label: str, timeout: int) -> Dict[str, Any]:
+        """Build, run and parse a single tool invocation"""
+        spec = TOOL_SPECS[name]
         try:
-            output_file = self.output_dir / 'raw' / f'katana_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cmd = [
-                'katana',
-                '-u', target,
-                '-jc',
-                '-o', str(output_file),
-                '-c', str(self.config.tools.threads),
-                '-timeout', str(self.config.tools.timeout),
-                '-silent'
-            ]
+            output_file = self._output_file(name, label)
             
-            result = await self.execute_tool(cmd)
+            # Bound the run so one stuck target can't hold up the whole phase
+            result = await self.execute_tool(build_cmd(arg, str(output_file), self.config), timeout=timeout)
             if not result.success:
                 return {'error': result.error}
             
             try:
                 if output_file.exists():
-                    with open(output_file) as f:
-                        return json.load(f)
+                    self._shards.setdefault(label, {})[name] = str(output_file)
+                    async with aiofiles.open(output_file, 'rb') as f:
+                        data = await f.read()
+                    return spec.parse(data)
                 return {'error': 'No output file generated'}
             except Exception as e:
-                return {'error': f"Error processing katana results: {e}"}
+                return {'error': f"Error processing {name} results: {e}"}
         except Exception as e:
-            return {'error': f"Error in katana: {e}"}
+            return {'error': f"Error in {name}: {e}"}
@@ -0,0 +1,30 @@
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+from core.utils.secure_config import ConfigManager
+from core.modules.web_fuzzing import WebFuzzingModule
+
+SHIPPED_CONFIG = Path(__file__).resolve().parents[2] / 'config' / 'config.yml'
+
+def make_module(config_file: Path, tmp_path: Path) -> WebFuzzingModule:
+    framework = Mock()
+    framework.config = ConfigManager(str(config_file))
+    framework.output_dir = tmp_path
+    return WebFuzzingModule(framework)
+
+@pytest.fixture(autouse=True)
+def in_tmp_dir(tmp_path, monkeypatch):
+    # ConfigManager creates the output directory relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+def test_shipped_config_runs_targets_one_by_one(tmp_path):
+    """The config ConfigManager loads by default leaves batching off"""
+    module = make_module(SHIPPED_CONFIG, tmp_path)
+    assert module.module_options == {'batch_targets': False}
+
+def test_batch_targets_comes_from_config(tmp_path):
+    """modules.web_fuzzing.batch_targets reaches module_options"""
+    config_file = tmp_path / 'config.yml'
+    config_file.write_text('modules:\n  web_fuzzing:\n    batch_targets: true\n')
+    module = make_module(config_file, tmp_path)
+    assert module.module_options['batch_targets'] is True
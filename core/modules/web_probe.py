@@ -1,5 +1,7 @@
 import os
-import json
+import orjson
+import subprocess
+import tempfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .base import BaseModule
 from ..utils.tools import check_tool_exists, run_tool
@@ -28,8 +30,6 @@ class WebProbeModule(BaseModule):
             if not check_tool_exists('httpx'):
                 return {'error': 'httpx not installed'}
 
-            output_file = self.session.get_raw_path('web_probe', 'httpx_output.json')
-            
             cmd = [
                 'httpx',
                 '-l', input_file,
@@ -38,12 +38,9 @@ class WebProbeModule(BaseModule):
                 '-title',
                 '-tech-detect',
                 '-json',
-                '-o', output_file,
                 '-threads', '50'
             ]
             
-            run_tool(cmd)
-            
             # Process results by status code
             status_results = {
                 '200': [],
@@ -51,26 +48,42 @@ class WebProbeModule(BaseModule):
                 'other': []
             }
             
-            if os.path.exists(output_file):
-                with open(output_file) as f:
-                    for line in f:
-                        try:
-                            result = json.loads(line)
-                            url = result.get('url', '')
-                            status_code = str(result.get('status-code', ''))
-                            
-                            if status_code == '200':
-                                status_results['200'].append(result)
-                            elif status_code == '403':
-                                status_results['403'].append(result)
-                            else:
-                                status_results['other'].append(result)
-                        except json.JSONDecodeError:
-                            continue
+            add_live = status_results['200'].append
+            add_forbidden = status_results['403'].append
+            add_other = status_results['other'].append
+            
+            # Classify lines as httpx prints them rather than round-tripping through a file
+            # stderr goes to a temp file so it can't fill a pipe and stall httpx while stdout is drained
+            with tempfile.TemporaryFile() as stderr_file, \
+                    subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, bufsize=1 << 20) as proc:
+                for line in proc.stdout:
+                    line = line.strip()
+                    # Skip blank and non-JSON lines with a byte check rather than a raised decode error
+                    if not line or line[0] != 0x7b:
+                        continue
+                    try:
+                        result = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    
+                    # httpx emits the status as a JSON int; newer releases renamed the key
+                    status_code = result.get('status_code') or result.get('status-code')
+                    if status_code == 200:
+                        add_live(result)
+                    elif status_code == 403:
+                        add_forbidden(result)
+                    else:
+                        add_other(result)
+                
+                # A crash or a rejected flag would otherwise look like no live hosts
+                if proc.wait() != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode(errors='replace').strip()
+                    self.logger.error(f"httpx exited with status {proc.returncode}: {stderr}")
+                    return {'error': stderr or f"httpx exited with status {proc.returncode}"}
             
             return {
                 'tool': 'httpx',
-                'raw_output': output_file,
                 'status_results': status_results
             }
                 
@@ -98,15 +111,22 @@ class WebProbeModule(BaseModule):
                 '-o', output_file
             ]
             
-            run_tool(cmd)
+            try:
+                run_tool(cmd)
+            except subprocess.CalledProcessError as e:
+                # Builds without list input still get every URL, just one process each
+                self.logger.warning(f"Batched 403-bypass failed ({e.returncode}), retrying per URL")
+                self._run_403_bypass_per_url(urls, output_file)
             
             bypassed_urls = set()
-            if os.path.exists(output_file):
-                with open(output_file) as f:
-                    for line in f:
-                        url = line.strip()
-                        if url:
-                            bypassed_urls.add(url)
+            # Opening the file answers whether it exists; no separate stat needed
+            try:
+                with open(output_file, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                bypassed_urls = {url.decode() for url in map(bytes.strip, data.splitlines()) if url}
             
             return {
                 'tool': '403-bypass',
@@ -118,6 +138,22 @@ class WebProbeModule(BaseModule):
             self.logger.error(f"Error in 403-bypass: {str(e)}")
             return {'error': str(e)}
 
+    def _run_403_bypass_per_url(self, urls, output_file):
+        """Run 403-bypass once per URL in parallel and merge their stdout into output_file"""
+        def scan_one(url):
+            try:
+                return run_tool(['403-bypass', '-u', url], capture_output=True)
+            except subprocess.CalledProcessError as e:
+                self.logger.error(f"403-bypass failed for {url}: {e.stderr}")
+                return ''
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_tasks) as executor:
+            outputs = list(executor.map(scan_one, urls))
+        
+        lines = [line.strip() for output in outputs for line in output.splitlines() if line.strip()]
+        with open(output_file, 'wb') as f:
+            f.write("".join(f"{line}\n" for line in lines).encode())
+
     def _save_results_by_status(self, results):
         """Save results organized by status code"""
         if 'httpx' not in results or 'status_results' not in results['httpx']:
@@ -127,9 +163,8 @@ class WebProbeModule(BaseModule):
         
         # Save live domains (200)
         live_domains_file = self.session.get_processed_path('web_probe', 'live_domains.txt')
-        with open(live_domains_file, 'w') as f:
-            for result in status_results['200']:
-                f.write(f"{result['url']}\n")
+        with open(live_domains_file, 'wb') as f:
+            f.write(b"".join(f"{result['url']}\n".encode() for result in status_results['200']))
         
         # Save status code summary
         status_summary = {
@@ -140,15 +175,21 @@ class WebProbeModule(BaseModule):
         }
         
         status_file = self.session.get_processed_path('web_probe', 'status_codes.json')
-        with open(status_file, 'w') as f:
-            json.dump(status_summary, f, indent=4)
+        with open(status_file, 'wb') as f:
+            f.write(orjson.dumps(status_summary, option=orjson.OPT_INDENT_2))
         
         # Save bypassed 403 URLs if available
-        if '403-bypass' in results and 'bypassed_urls' in results['403-bypass']:
-            bypassed_file = self.session.get_processed_path('web_probe', '403_bypassed.txt')
-            with open(bypassed_file, 'w') as f:
-                for url in results['403-bypass']['bypassed_urls']:
-                    f.write(f"{url}\n")
+        if '403-bypass' in results:
+            self._save_bypassed_urls(results['403-bypass'])
+
+    def _save_bypassed_urls(self, bypass_result):
+        """Save URLs that 403-bypass got through"""
+        if 'bypassed_urls' not in bypass_result:
+            return
+            
+        bypassed_file = self.session.get_processed_path('web_probe', '403_bypassed.txt')
+        with open(bypassed_file, 'wb') as f:
+            f.write(b"".join(f"{url}\n".encode() for url in bypass_result['bypassed_urls']))
 
     def run(self):
         """Execute web probing tools and process results"""
@@ -1,18 +1,91 @@
 import asyncio
-import json
-from typing import Dict, Any, List, Optional, Set, Type
+import aiohttp
+import hashlib
+import orjson
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple, Type
 from pathlib import Path
 from datetime import datetime
 from core.utils.rate_limiter import RateLimiter
 from core.utils.cache_manager import CacheManager
+from core.utils.ndjson import iter_ndjson
+from core.utils.tool_checker import tool_path
 from .base_module import BaseModule, ToolResult
 
+# Header and path tricks tried against URLs that answered 403
+_BYPASS_HEADERS = [
+    {'X-Forwarded-For': '127.0.0.1'},
+    {'X-Real-IP': '127.0.0.1'},
+    {'X-Originating-IP': '127.0.0.1'},
+    {'X-Custom-IP-Authorization': '127.0.0.1'},
+    {'X-Forwarded-Host': 'localhost'}
+]
+_BYPASS_SUFFIXES = ['/.', '/..;/', '%20', '%2e/', '/*', '?', '#']
+
+_SCHEMES = ('http://', 'https://')
+# Buffered stdout size at which NDJSON parsing is shipped to the process pool
+_PARSE_BATCH_BYTES = 4 << 20
+
+def _parse_ndjson_batch(data: bytes) -> Tuple[List[Any], int]:
+    """Parse a block of complete NDJSON lines, returning the records and a count of skipped lines"""
+    records = []
+    skipped = 0
+    for line in iter_ndjson(data):
+        # Skip banners and log lines with a byte check rather than a raised decode error
+        if line[0] != 0x7b:
+            skipped += 1
+            continue
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            skipped += 1
+    return records, skipped
+
+def _httpx_key(record: Dict[str, Any]) -> Optional[str]:
+    """Identify an httpx record by its URL; redirects often report one URL more than once"""
+    return record.get('url')
+
+def _naabu_key(record: Dict[str, Any]) -> Optional[Tuple[Any, Any]]:
+    """Identify a naabu record by host and port, ignoring its timestamp"""
+    host = record.get('host') or record.get('ip')
+    port = record.get('port')
+    if isinstance(port, dict):
+        port = port.get('Port') or port.get('port')
+    return (host, port) if host and port else None
+
+def _parse_nmap_host(elem: ET.Element) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Turn a finished nmap <host> element into (address, host details)"""
+    address = elem.find('address')
+    if address is None:
+        return None
+    
+    ports = []
+    for port in elem.iterfind('ports/port'):
+        state = port.find('state')
+        service = port.find('service')
+        ports.append({
+            'port': int(port.get('portid')),
+            'protocol': port.get('protocol'),
+            'state': state.get('state') if state is not None else None,
+            'service': service.get('name') if service is not None else None,
+            'product': service.get('product') if service is not None else None,
+            'version': service.get('version') if service is not None else None
+        })
+    
+    return address.get('addr'), {
+        'hostnames': [h.get('name') for h in elem.iterfind('hostnames/hostname')],
+        'ports': ports
+    }
+
 class WebProbingModule(BaseModule):
     def __init__(self, framework):
         super().__init__(framework)
         self.tools = {
             'naabu': self._run_naabu,
-            'httpx': self._run_httpx
+            'httpx': self._run_httpx,
+            'nmap': self._run_nmap
         }
         self.running_tasks: Set[asyncio.Task] = set()
         self.max_concurrent_tasks = self.config.tools.threads
@@ -24,6 +97,10 @@ class WebProbingModule(BaseModule):
             cache_dir=self.output_dir / 'cache',
             ttl=self.config.performance.cache_ttl
         )
+        self.http: Optional[aiohttp.ClientSession] = None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # Optional stages, switched on under modules.web_probing in the config
+        self.module_options: Dict[str, Any] = self.config.modules.get('web_probing') or {}
 
     def get_required_tools(self) -> Dict[str, Optional[str]]:
         """Return required tools and their minimum versions"""
@@ -57,10 +134,29 @@ class WebProbingModule(BaseModule):
                     self.logger.error(f"Error checking {tool} version: {result.error}")
             except Exception as e:
                 self.logger.error(f"Error checking {tool} version: {e}")
+        
+        # One pooled session serves the opt-in 403 bypass checks
+        if self.module_options.get('bypass_403', False) and (self.http is None or self.http.closed):
+            self.http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrent_tasks,
+                    ttl_dns_cache=300,
+                    ssl=None if self.config.security.verify_tls else False
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.config.tools.timeout)
+            )
 
     async def cleanup(self) -> None:
         """Cleanup module resources"""
         try:
+            if self.http is not None:
+                await self.http.close()
+                self.http = None
+            
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = None
+            
             # Stop rate limiter monitoring
             await self.rate_limiter.stop_monitoring()
             
@@ -106,15 +202,56 @@ class WebProbingModule(BaseModule):
             
             results = {}
             
-            # Run naabu for port scanning
-            naabu_results = await self._run_naabu(targets)
-            if naabu_results and naabu_results.success:
+            # Write the target list once and point every tool at the same file
+            targets_file = self._write_targets(targets, 'probe_targets.txt')
+            
+            async def ports_then_services():
+                naabu = await self._run_naabu(targets, targets_file)
+                # Service detection is slow and opt-in; nmap only version-scans
+                # what naabu's fast sweep found open
+                if not self.module_options.get('nmap', False):
+                    return naabu, None
+                open_ports = naabu.output if naabu.success else None
+                return naabu, await self._run_nmap(open_ports)
+            
+            # httpx is independent of the port pipeline, so run them side by side
+            port_pipeline, httpx_results = await asyncio.gather(
+                ports_then_services(),
+                self._run_httpx(targets, targets_file),
+                return_exceptions=True
+            )
+            naabu_results = nmap_results = port_pipeline
+            if isinstance(port_pipeline, tuple):
+                naabu_results, nmap_results = port_pipeline
+            for name, result in (('port scan', port_pipeline), ('httpx', httpx_results)):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error in {name}: {result}")
+            
+            # Collect naabu port scan results
+            if isinstance(naabu_results, ToolResult) and naabu_results.success:
                 results['ports'] = naabu_results.output
             
-            # Run httpx for web probing
-            httpx_results = await self._run_httpx(targets)
-            if httpx_results and httpx_results.success:
+            # Collect httpx probe results
+            if isinstance(httpx_results, ToolResult) and httpx_results.success:
                 results['web'] = httpx_results.output
+                
+                # Try to get past anything that answered 403; setup only opens
+                # the session when modules.web_probing.bypass_403 is set
+                if self.http is not None:
+                    forbidden_urls = [
+                        r['url'] for r in httpx_results.output
+                        if (r.get('status_code') or r.get('status-code')) == 403 and 'url' in r
+                    ]
+                    if forbidden_urls:
+                        self.logger.info(f"Found {len(forbidden_urls)} URLs returning 403, trying bypasses...")
+                        results['403_bypass'] = await self._run_403_bypass(forbidden_urls)
+            
+            # Collect nmap service detection results
+            if isinstance(nmap_results, ToolResult):
+                if nmap_results.success:
+                    results['services'] = nmap_results.output
+                else:
+                    results.setdefault('errors', {})['nmap'] = nmap_results.error
             
             return results
             
@@ -124,97 +261,372 @@ class WebProbingModule(BaseModule):
         finally:
             await self.cleanup()
 
-    async def _run_naabu(self, targets: List[str]) -> ToolResult:
+    async def _run_naabu(self, targets: List[str], targets_file: Path) -> ToolResult:
         """Run naabu port scanner"""
         try:
-            output_file = self.output_dir / 'naabu_results.txt'
-            
             cmd = [
                 'naabu',
                 '--silent',
-                '--json',
-                '--output', str(output_file)
+                '--json'
             ]
-            cmd.extend(['--host', ','.join(targets)])
+            cache_key = self._cache_key(targets, cmd)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                self.logger.info(f"Using cached naabu results for {len(targets)} targets")
+                return ToolResult(success=True, output=cached, exit_code=0)
             
-            result = await self.execute_tool(cmd)
+            cmd.extend(['--list', str(targets_file)])
+            
+            result = await self._stream_ndjson(cmd, 'naabu', _naabu_key)
             if not result.success:
                 self.logger.error(f"Naabu failed: {result.error}")
-                return result
-            
-            if output_file.exists():
-                try:
-                    results = []
-                    for line in output_file.read_text().splitlines():
-                        if line.strip():
-                            try:
-                                results.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                self.logger.warning(f"Failed to parse naabu result line: {line}")
-                    
-                    result.output = results
-                    return result
-                except Exception as e:
-                    self.logger.error(f"Error reading naabu results: {e}")
-                    return ToolResult(success=False, error=str(e), exit_code=-1)
-            
-            return ToolResult(success=False, error="No output file generated", exit_code=-1)
+            else:
+                self._cache_store(cache_key, result.output)
+            return result
             
         except Exception as e:
             self.logger.error(f"Error in naabu: {e}")
             return ToolResult(success=False, error=str(e), exit_code=-1)
 
-    async def _run_httpx(self, targets: List[str]) -> ToolResult:
+    async def _run_httpx(self, targets: List[str], targets_file: Path) -> ToolResult:
         """Run httpx web prober"""
         try:
-            output_file = self.output_dir / 'httpx_results.json'
-            
             cmd = [
                 'httpx',
                 '--silent',
                 '--json',
-                '--output', str(output_file),
                 '--status-code',
                 '--title',
                 '--web-server',
                 '--tech-detect',
                 '--follow-redirects'
             ]
-            cmd.extend(['--url', ','.join(targets)])
+            cache_key = self._cache_key(targets, cmd)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                self.logger.info(f"Using cached httpx results for {len(targets)} targets")
+                return ToolResult(success=True, output=cached, exit_code=0)
             
-            result = await self.execute_tool(cmd)
+            cmd.extend(['--list', str(targets_file)])
+            
+            result = await self._stream_ndjson(cmd, 'httpx', _httpx_key)
             if not result.success:
                 self.logger.error(f"Httpx failed: {result.error}")
-                return result
+            else:
+                self._cache_store(cache_key, result.output)
+            return result
             
-            if output_file.exists():
-                try:
-                    results = []
-                    for line in output_file.read_text().splitlines():
-                        if line.strip():
-                            try:
-                                results.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                self.logger.warning(f"Failed to parse httpx result line: {line}")
-                    
-                    result.output = results
-                    return result
-                except Exception as e:
-                    self.logger.error(f"Error reading httpx results: {e}")
-                    return ToolResult(success=False, error=str(e), exit_code=-1)
+        except Exception as e:
+            self.logger.error(f"Error in httpx: {e}")
+            return ToolResult(success=False, error=str(e), exit_code=-1)
+
+    async def _run_nmap(self, open_ports: Optional[List[Dict[str, Any]]]) -> ToolResult:
+        """Run nmap service detection over the ports naabu found open"""
+        try:
+            if open_ports is None:
+                # Sweeping every port instead would make the failure path the slowest one
+                self.logger.error("Naabu failed, skipping nmap")
+                return ToolResult(success=False, error="Skipped nmap: naabu port scan failed", exit_code=-1)
+            
+            if not await self._check_tool_exists('nmap'):
+                return ToolResult(success=False, error="Tool nmap not found", exit_code=-1)
+            
+            # Group hosts by their open port set so each group needs one nmap run
+            host_ports: Dict[str, Set[int]] = {}
+            for record in open_ports:
+                host = record.get('host') or record.get('ip')
+                port = record.get('port')
+                if isinstance(port, dict):
+                    port = port.get('Port') or port.get('port')
+                if host and port:
+                    host_ports.setdefault(host, set()).add(int(port))
+            
+            groups: Dict[str, List[str]] = {}
+            for host, ports in host_ports.items():
+                groups.setdefault(','.join(map(str, sorted(ports))), []).append(host)
+            
+            if not groups:
+                self.logger.info("Naabu found no open ports, skipping nmap")
+                return ToolResult(success=True, output={}, exit_code=0)
+            
+            # Each group is a full nmap process, so cap how many run at once
+            semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
             
-            return ToolResult(success=False, error="No output file generated", exit_code=-1)
+            async def scan_group(hosts: List[str], ports: str, label: str) -> ToolResult:
+                async with semaphore:
+                    return await self._nmap_scan(hosts, ports, label)
+            
+            # --host-timeout only bounds single hosts, so bound the stage as a whole
+            timeout = self.module_options.get('nmap_timeout', self.config.tools.per_target_timeout)
+            try:
+                scans = await asyncio.wait_for(asyncio.gather(*(
+                    scan_group(hosts, ports, str(i)) for i, (ports, hosts) in enumerate(groups.items())
+                )), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.logger.error(f"Nmap timed out after {timeout}s")
+                return ToolResult(success=False, error="Tool nmap execution timed out", exit_code=-1)
+            
+            hosts = {}
+            errors = []
+            for scan in scans:
+                if scan.success:
+                    hosts.update(scan.output)
+                elif scan.error:
+                    errors.append(scan.error)
+            return ToolResult(
+                success=not errors or bool(hosts),
+                output=hosts,
+                error="\n".join(errors) or None,
+                exit_code=0 if not errors else -1
+            )
             
         except Exception as e:
-            self.logger.error(f"Error in httpx: {e}")
+            self.logger.error(f"Error in nmap: {e}")
             return ToolResult(success=False, error=str(e), exit_code=-1)
 
+    async def _nmap_scan(self, targets: List[str], ports: str, label: str) -> ToolResult:
+        """Run one nmap process over targets and ports, parsing its XML report as it streams"""
+        cache_key = self._cache_key(targets, ['nmap', f'-p{ports}'])
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            self.logger.info(f"Using cached nmap results for {len(targets)} targets")
+            return ToolResult(success=True, output=cached, exit_code=0)
+        
+        targets_file = self._write_targets(targets, f'nmap_targets_{label}.txt')
+        
+        # Each host is bounded by --host-timeout since the scan as a whole
+        # runs without one. Large host groups let nmap probe many hosts in
+        # parallel, and discovery already established the hosts exist, so
+        # skip ping and reverse DNS
+        cmd = [
+            'nmap',
+            '-sV',
+            '-sC',
+            f'-p{ports}',
+            '-Pn',
+            '-n',
+            '--min-rate=1000',
+            '--min-hostgroup', '64',
+            '--host-timeout', f'{self.config.tools.timeout * 10}s',
+            '-iL', str(targets_file),
+            '-oX', '-'
+        ]
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        
+        # Only one <host> element is held in memory at a time
+        parser = ET.XMLPullParser(events=('end',))
+        hosts = {}
+        try:
+            while True:
+                chunk = await process.stdout.read(1 << 16)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                for _, elem in parser.read_events():
+                    if elem.tag == 'host':
+                        parsed = _parse_nmap_host(elem)
+                        if parsed:
+                            hosts[parsed[0]] = parsed[1]
+                        elem.clear()
+            parser.close()
+            
+            await process.wait()
+            stderr = await stderr_task
+        finally:
+            # Cancelled by the stage timeout; don't leave nmap running
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+                stderr_task.cancel()
+        if process.returncode != 0:
+            self.logger.error(f"Nmap failed: {stderr.decode() if stderr else process.returncode}")
+        else:
+            self._cache_store(cache_key, hosts)
+        
+        return ToolResult(
+            success=process.returncode == 0,
+            output=hosts,
+            error=stderr.decode() if stderr else None,
+            exit_code=process.returncode
+        )
+
+    async def _run_403_bypass(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Try header and path bypasses on 403 URLs over the shared HTTP session"""
+        # Bound the requests in flight, not the URLs; each URL fans out to every bypass attempt
+        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        
+        async def attempt(url: str, headers: Optional[Dict[str, str]], target: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                if not await self.rate_limiter.acquire():
+                    self.logger.debug(f"Rate limited, skipping bypass attempt on {target}")
+                    return None
+                try:
+                    async with self.http.get(target, headers=headers, allow_redirects=False) as response:
+                        if response.status < 400:
+                            technique = next(iter(headers)) if headers else target[len(url):]
+                            return {'url': url, 'bypass_url': target, 'technique': technique, 'status_code': response.status}
+                except Exception as e:
+                    # One bad attempt (an odd URL, a decode error) mustn't lose the probe results
+                    self.logger.debug(f"Bypass attempt on {target} failed: {e}")
+                return None
+        
+        async def bypass(url: str) -> List[Dict[str, Any]]:
+            base = url.rstrip('/')
+            attempts = [attempt(url, headers, url) for headers in _BYPASS_HEADERS]
+            attempts.extend(attempt(url, None, base + suffix) for suffix in _BYPASS_SUFFIXES)
+            return [hit for hit in await asyncio.gather(*attempts) if hit]
+        
+        bypassed = []
+        for hits in await asyncio.gather(*(bypass(url) for url in urls)):
+            bypassed.extend(hits)
+        return bypassed
+
+    def _write_targets(self, targets: List[str], name: str) -> Path:
+        """Write a target list under temp/ for tools that read hosts from a file"""
+        targets_file = self.output_dir / 'temp' / name
+        targets_file.parent.mkdir(parents=True, exist_ok=True)
+        targets_file.write_text("\n".join(targets) + "\n")
+        return targets_file
+
+    def _cache_key(self, targets: List[str], cmd: List[str]) -> str:
+        """Key a scan on its target set, arguments and tool binary, independent of target order"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\n".join(sorted(targets)).encode())
+        digest.update(b"\0")
+        digest.update("\0".join(cmd).encode())
+        # An upgraded or replaced binary invalidates earlier results
+        path = tool_path(cmd[0])
+        if path:
+            try:
+                digest.update(f"\0{path}:{os.stat(path).st_mtime_ns}".encode())
+            except OSError:
+                pass
+        return f"{cmd[0]}:{digest.hexdigest()}"
+
+    def _cache_lookup(self, key: str) -> Optional[Any]:
+        """Find earlier results in memory or, failing that, on disk"""
+        if not self.config.performance.cache_results or getattr(self.framework, 'no_cache', False):
+            return None
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.cache.get_persistent(key)
+            if cached is not None:
+                self.cache.set(key, cached)
+        return cached
+
+    def _cache_store(self, key: str, value: Any) -> None:
+        """Remember results in memory and on disk for later runs"""
+        if not self.config.performance.cache_results or getattr(self.framework, 'no_cache', False):
+            return
+        self.cache.set(key, value)
+        self.cache.set_persistent(key, value)
+
+    async def _stream_ndjson(self, cmd: List[str], tool: str,
+                             dedupe_key: Optional[Callable[[Dict[str, Any]], Any]] = None) -> ToolResult:
+        """Run a tool that prints NDJSON and parse its stdout while it is still running, dropping repeats by dedupe_key"""
+        if not await self._check_tool_exists(cmd[0]):
+            return ToolResult(success=False, error=f"Tool {cmd[0]} not found", exit_code=-1)
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=1 << 20
+        )
+        # Drain stderr alongside stdout so a chatty tool can't fill its pipe and stall
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        loop = asyncio.get_running_loop()
+        batches = []
+        buf = bytearray()
+        
+        async def consume() -> None:
+            # Hand complete lines to the parse pool in large batches while the
+            # tool keeps running, so decoding never competes with the event loop
+            while True:
+                chunk = await process.stdout.read(1 << 20)
+                if not chunk:
+                    break
+                buf.extend(chunk)
+                if len(buf) >= _PARSE_BATCH_BYTES:
+                    cut = buf.rfind(b"\n") + 1
+                    if cut:
+                        batches.append(loop.run_in_executor(self._get_parse_pool(), _parse_ndjson_batch, bytes(buf[:cut])))
+                        del buf[:cut]
+            await process.wait()
+        
+        try:
+            await asyncio.wait_for(consume(), timeout=self.config.tools.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            stderr_task.cancel()
+            for batch in batches:
+                batch.cancel()
+            return ToolResult(success=False, error=f"Tool {cmd[0]} execution timed out", exit_code=-1)
+        
+        parsed = await asyncio.gather(*batches)
+        # A small tail isn't worth a round trip to another process
+        if buf:
+            parsed.append(_parse_ndjson_batch(bytes(buf)))
+        
+        results = []
+        skipped = 0
+        seen = set()
+        for records, bad in parsed:
+            skipped += bad
+            if dedupe_key is None:
+                results.extend(records)
+                continue
+            for record in records:
+                key = dedupe_key(record)
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                results.append(record)
+        if skipped:
+            self.logger.debug(f"Skipped {skipped} non-JSON {tool} output lines")
+        
+        stderr = await stderr_task
+        return ToolResult(
+            success=process.returncode == 0,
+            output=results,
+            error=stderr.decode() if stderr else None,
+            exit_code=process.returncode
+        )
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Get the NDJSON parse pool, starting it the first time a large output needs it"""
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._parse_pool
+
     async def _get_targets(self) -> List[str]:
         """Get targets from discovery results"""
         try:
             discovery_results = await self.framework.session_manager.get_results('discovery')
             if discovery_results and 'subdomains' in discovery_results:
-                return discovery_results['subdomains']
+                # Normalise and dedupe in one pass; naabu, httpx and nmap all
+                # take bare hosts, so a scheme or trailing dot only costs a rescan
+                seen = set()
+                targets = []
+                for subdomain in discovery_results['subdomains']:
+                    if not isinstance(subdomain, str):
+                        continue
+                    host = subdomain.strip().lower()
+                    if host.startswith(_SCHEMES):
+                        host = host.split('://', 1)[1]
+                    host = host.split('/', 1)[0].rstrip('.')
+                    if host and host not in seen:
+                        seen.add(host)
+                        targets.append(host)
+                return targets
         except Exception as e:
             self.logger.error(f"Error getting discovery results: {e}")
         return []
\ No newline at end of file
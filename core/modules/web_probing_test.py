@@ -0,0 +1,72 @@
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, Mock
+from core.utils.secure_config import ConfigManager
+from core.modules.web_probing import WebProbingModule
+
+SHIPPED_CONFIG = Path(__file__).resolve().parents[2] / 'config' / 'config.yml'
+
+def make_module(config_file: Path, tmp_path: Path) -> WebProbingModule:
+    framework = Mock()
+    framework.config = ConfigManager(str(config_file))
+    framework.output_dir = tmp_path
+    return WebProbingModule(framework)
+
+@pytest.fixture(autouse=True)
+def in_tmp_dir(tmp_path, monkeypatch):
+    # ConfigManager creates the output directory relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+def test_shipped_config_leaves_optional_stages_off(tmp_path):
+    """The config ConfigManager loads by default documents the stages, all off"""
+    module = make_module(SHIPPED_CONFIG, tmp_path)
+    assert module.module_options['nmap'] is False
+    assert module.module_options['nmap_timeout'] == 1800
+    assert module.module_options['bypass_403'] is False
+
+def test_module_options_come_from_config(tmp_path):
+    """Flags under modules.web_probing reach module_options"""
+    config_file = tmp_path / 'config.yml'
+    config_file.write_text('modules:\n  web_probing:\n    nmap: true\n    nmap_timeout: 60\n')
+    module = make_module(config_file, tmp_path)
+    assert module.module_options == {'nmap': True, 'nmap_timeout': 60}
+
+def test_missing_modules_section(tmp_path):
+    """A config without a modules section leaves every optional stage off"""
+    config_file = tmp_path / 'config.yml'
+    config_file.write_text('tools:\n  threads: 4\n')
+    module = make_module(config_file, tmp_path)
+    assert module.module_options == {}
+    assert not module.module_options.get('nmap', False)
+
+def fake_response(status: int):
+    response = MagicMock()
+    response.__aenter__.return_value.status = status
+    return response
+
+@pytest.mark.asyncio
+async def test_403_bypass_survives_failing_attempts(tmp_path):
+    """An unexpected error from one attempt doesn't abort the others"""
+    module = make_module(SHIPPED_CONFIG, tmp_path)
+    url = 'https://example.com/admin'
+
+    def get(target, headers=None, allow_redirects=True):
+        if headers and 'X-Real-IP' in headers:
+            return fake_response(200)
+        if target.endswith('%20'):
+            raise ValueError('bad URL')
+        return fake_response(403)
+    module.http = Mock(get=Mock(side_effect=get))
+
+    hits = await module._run_403_bypass([url])
+    assert hits == [{'url': url, 'bypass_url': url, 'technique': 'X-Real-IP', 'status_code': 200}]
+
+@pytest.mark.asyncio
+async def test_403_bypass_skips_throttled_attempts(tmp_path):
+    """No request goes out when the rate limiter refuses a token"""
+    module = make_module(SHIPPED_CONFIG, tmp_path)
+    module.rate_limiter.acquire = AsyncMock(return_value=False)
+    module.http = Mock(get=Mock(side_effect=lambda *a, **kw: fake_response(200)))
+
+    assert await module._run_403_bypass(['https://example.com/admin']) == []
+    module.http.get.assert_not_called()
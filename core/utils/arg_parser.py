@@ -7,7 +7,7 @@ def parse_args() -> argparse.Namespace:
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
         description='LLEO - Security Testing Framework',
-        usage='%(prog)s [-h] -d DOMAIN [-s] [-v] [-o OUTPUT] [-c CONFIG] [--no-color] [--force-new]'
+        usage='%(prog)s [-h] -d DOMAIN [-s] [-v] [-o OUTPUT] [-c CONFIG] [--no-color] [--force-new] [--no-cache]'
     )
     
     parser.add_argument(
@@ -52,6 +52,12 @@ def parse_args() -> argparse.Namespace:
         help='Force new session'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore cached tool results and rescan'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -1,12 +1,11 @@
 from typing import Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 from pathlib import Path
 import json
 
 class Banner:
     def __init__(self, no_color: bool = False):
+        # rich is only imported once a banner is actually printed
+        from rich.console import Console
         self.console = Console(color_system=None if no_color else 'auto')
         self._load_version()
 
@@ -23,6 +22,9 @@ class Banner:
 
     def print_banner(self, show_usage: bool = True) -> None:
         """Print the LLEO banner with optional usage information"""
+        from rich.panel import Panel
+        from rich.text import Text
+        
         banner_text = Text()
         banner_text.append('\n')
         banner_text.append('██╗     ██╗     ███████╗ ██████╗\n', style='blue')
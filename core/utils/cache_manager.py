@@ -1,7 +1,10 @@
 from typing import Any, Dict, Optional
 from cachetools import TTLCache
 from datetime import timedelta
-import json
+import orjson
+import hashlib
+import os
+import time
 from pathlib import Path
 import logging
 
@@ -9,6 +12,7 @@ class CacheManager:
 	def __init__(self, cache_dir: Path, ttl: int = 3600):
 		self.cache_dir = cache_dir
 		self.cache_dir.mkdir(parents=True, exist_ok=True)
+		self.ttl = ttl
 		self.memory_cache = TTLCache(maxsize=100, ttl=ttl)
 		self.logger = logging.getLogger(__name__)
 
@@ -20,6 +24,32 @@ class CacheManager:
 		"""Set value in cache"""
 		self.memory_cache[key] = value
 
+	def _persistent_path(self, key: str) -> Path:
+		return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+	def get_persistent(self, key: str) -> Optional[Any]:
+		"""Get value from the on-disk cache if it was written within the TTL"""
+		path = self._persistent_path(key)
+		try:
+			if time.time() - path.stat().st_mtime > self.ttl:
+				return None
+			return orjson.loads(path.read_bytes())
+		except FileNotFoundError:
+			return None
+		except Exception as e:
+			self.logger.error(f"Error reading cache entry {key}: {e}")
+			return None
+
+	def set_persistent(self, key: str, value: Any) -> None:
+		"""Set value in the on-disk cache so later runs can reuse it"""
+		path = self._persistent_path(key)
+		tmp_path = path.with_suffix('.tmp')
+		try:
+			tmp_path.write_bytes(orjson.dumps(value))
+			os.replace(tmp_path, path)
+		except Exception as e:
+			self.logger.error(f"Error writing cache entry {key}: {e}")
+
 	def clear(self) -> None:
 		"""Clear cache"""
 		self.memory_cache.clear()
@@ -28,8 +58,9 @@ class CacheManager:
 		"""Persist cache to disk"""
 		try:
 			cache_file = self.cache_dir / filename
-			with open(cache_file, 'w') as f:
-				json.dump(dict(self.memory_cache), f)
+			tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+			tmp_file.write_bytes(orjson.dumps(dict(self.memory_cache)))
+			os.replace(tmp_file, cache_file)
 		except Exception as e:
 			self.logger.error(f"Error persisting cache: {e}")
 
@@ -38,8 +69,6 @@ class CacheManager:
 		try:
 			cache_file = self.cache_dir / filename
 			if cache_file.exists():
-				with open(cache_file) as f:
-					data = json.load(f)
-					self.memory_cache.update(data)
+				self.memory_cache.update(orjson.loads(cache_file.read_bytes()))
 		except Exception as e:
-			self.logger.error(f"Error loading cache: {e}")
\ No newline at end of file
+			self.logger.error(f"Error loading cache: {e}")
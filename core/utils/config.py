@@ -1,12 +1,55 @@
 import os
 import json
-import yaml
+import orjson
 import re
 from pathlib import Path
 import logging
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 
+_API_KEY_PATTERNS = {
+    provider: re.compile(pattern) for provider, pattern in {
+        'securitytrails': r'^[a-zA-Z0-9]{32}$',
+        'shodan': r'^[a-zA-Z0-9]{32}$',
+        'censys': r'^[a-zA-Z0-9]{32}$',
+        'virustotal': r'^[a-zA-Z0-9]{64}$',
+        'wpscan': r'^[a-zA-Z0-9]{32}$'
+    }.items()
+}
+
+def load_yaml_cached(config_file) -> Any:
+    """Load a YAML file, reusing a JSON copy of the parse while the file is unchanged"""
+    config_file = Path(config_file)
+    cache_path = config_file.with_name(config_file.name + '.cache.json')
+    # Key on the YAML's own stat rather than comparing mtimes, so a file
+    # restored with an older timestamp (cp -p, git checkout) still misses
+    st = config_file.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+        if cached.get('stat') == stamp:
+            return cached['data']
+    except (OSError, orjson.JSONDecodeError, AttributeError, KeyError):
+        pass
+
+    # Only a cache miss pays for importing the YAML parser. libyaml's C
+    # loader is several times faster; PyYAML may be built without it
+    import yaml
+    with open(config_file, 'r') as f:
+        data = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+    try:
+        blob = orjson.dumps({'stat': stamp, 'data': data})
+        # Only cache parses that survive JSON unchanged (no dates, non-string keys, ...)
+        if orjson.loads(blob)['data'] == data:
+            tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+            tmp_path.write_bytes(blob)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError):
+        # Read-only config directories simply go without the cache
+        pass
+    return data
+
 @dataclass
 class ConfigVersion:
     major: int
@@ -34,6 +77,7 @@ class ToolConfig:
     burst_size: int = 10
     max_memory_percent: int = 80
     max_disk_percent: int = 90
+    per_target_timeout: int = 1800
 
 @dataclass
 class ApiKeys:
@@ -66,6 +110,7 @@ class PerformanceConfig:
     cache_results: bool = True
     cache_ttl: int = 3600
     max_memory_percent: int = 80
+    bloom_dedupe: bool = False
 
 @dataclass
 class ModuleConfig:
@@ -122,7 +167,8 @@ class Config:
                     'rate_limit': 150,
                     'timeout': 30,
                     'retry_count': 3,
-                    'retry_delay': 5
+                    'retry_delay': 5,
+                    'per_target_timeout': 1800
                 },
                 'api_keys': {
                     'securitytrails': self._get_env_var('SECURITYTRAILS_KEY'),
@@ -149,33 +195,38 @@ class Config:
                 'performance': {
                     'cache_results': True,
                     'cache_ttl': 3600,
-                    'max_memory_percent': 80
+                    'max_memory_percent': 80,
+                    'bloom_dedupe': False
                 }
             }
             
             # Look for config files in multiple locations
             config_locations = [
-                os.path.expanduser('~/.config/lleo/config.yml'),
-                'config/config.yml'
+                Path.home() / '.config' / 'lleo' / 'config.yml',
+                Path('config/config.yml')
             ]
             
-            # Try to load config from file
+            # Try to load config from file, stopping at the first one found
+            found = False
             for config_file in config_locations:
-                if os.path.exists(config_file):
-                    self.config_file = Path(config_file)
-                    with open(config_file, 'r') as f:
-                        file_config = yaml.safe_load(f)
+                if config_file.is_file():
+                    found = True
+                    self.config_file = config_file
+                    file_config = load_yaml_cached(config_file)
+                    
+                    if file_config:
+                        # Check version compatibility
+                        if 'version' in file_config:
+                            file_version = ConfigVersion.from_string(file_config['version'])
+                            if file_version.major > self.version.major:
+                                raise ValueError(f"Config version {file_version} is not compatible with current version {self.version}")
                         
-                        if file_config:
-                            # Check version compatibility
-                            if 'version' in file_config:
-                                file_version = ConfigVersion.from_string(file_config['version'])
-                                if file_version.major > self.version.major:
-                                    raise ValueError(f"Config version {file_version} is not compatible with current version {self.version}")
-                            
-                            # Update default config with file config
-                            self._deep_update(self.config, file_config)
-                        break
+                        # Update default config with file config
+                        self._deep_update(self.config, file_config)
+                    break
+            
+            if not found:
+                logging.debug("No config file found, using defaults")
             
         except Exception as e:
             logging.error(f"Error loading config: {str(e)}")
@@ -186,19 +237,26 @@ class Config:
         return os.getenv(f"{self.env_prefix}{name}", default)
 
     def _deep_update(self, base_dict: Dict, update_dict: Dict) -> Dict:
-        """Recursively update a dictionary"""
-        for key, value in update_dict.items():
-            if isinstance(value, dict) and key in base_dict and isinstance(base_dict[key], dict):
-                self._deep_update(base_dict[key], value)
-            else:
-                # Don't override environment variables for API keys
-                if key == 'api_keys' and isinstance(value, dict):
+        """Merge update_dict into base_dict in place, walking nested dicts with a stack"""
+        # Snapshot which prefixed env vars are set so the walk only does set lookups
+        env_set = {
+            name for name, value in os.environ.items()
+            if value and name.startswith(self.env_prefix)
+        }
+        stack = [(base_dict, update_dict)]
+        while stack:
+            base, update = stack.pop()
+            for key, value in update.items():
+                if isinstance(value, dict) and isinstance(base.get(key), dict):
+                    stack.append((base[key], value))
+                elif key == 'api_keys' and isinstance(value, dict):
+                    # Don't override environment variables for API keys
+                    api_keys = base.setdefault(key, {})
                     for api_key, api_value in value.items():
-                        env_var = f'{self.env_prefix}{api_key.upper()}_KEY'
-                        if not os.getenv(env_var):
-                            base_dict[key][api_key] = api_value
+                        if f'{self.env_prefix}{api_key.upper()}_KEY' not in env_set:
+                            api_keys[api_key] = api_value
                 else:
-                    base_dict[key] = value
+                    base[key] = value
         return base_dict
 
     def validate_config(self) -> None:
@@ -236,16 +294,9 @@ class Config:
 
     def _validate_api_key_format(self, provider: str, key: str) -> bool:
         """Validate API key format for different providers"""
-        patterns = {
-            'securitytrails': r'^[a-zA-Z0-9]{32}$',
-            'shodan': r'^[a-zA-Z0-9]{32}$',
-            'censys': r'^[a-zA-Z0-9]{32}$',
-            'virustotal': r'^[a-zA-Z0-9]{64}$',
-            'wpscan': r'^[a-zA-Z0-9]{32}$'
-        }
-        
-        if provider in patterns:
-            return bool(re.match(patterns[provider], key))
+        pattern = _API_KEY_PATTERNS.get(provider)
+        if pattern is not None:
+            return bool(pattern.match(key))
         return True  # Return True for unknown providers
 
     def save(self) -> None:
@@ -254,6 +305,8 @@ class Config:
             return
             
         try:
+            import yaml
+            
             # Create backup
             if self.config_file.exists():
                 backup_path = self.config_file.with_suffix('.yml.bak')
@@ -1,13 +1,24 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Deque, Tuple
+from collections import OrderedDict, defaultdict, deque
 import asyncio
+import hashlib
+import heapq
+import time
 import json
+import orjson
 import aiohttp
 from datetime import datetime
 from pathlib import Path
 import logging
 from ..utils.secure_config import ConfigManager
 
+# Identical (module, tool, params) submissions reuse a task this recent
+RESULT_CACHE_TTL = 3600
+RESULT_CACHE_SIZE = 10_000
+# Seconds without a heartbeat before a worker is considered dead
+HEARTBEAT_TIMEOUT = 60
+
 @dataclass
 class WorkerInfo:
 	"""Information about worker node"""
@@ -15,7 +26,8 @@ class WorkerInfo:
 	address: str
 	status: str = 'idle'
 	capabilities: Set[str] = field(default_factory=set)
-	last_heartbeat: datetime = field(default_factory=datetime.now)
+	# time.monotonic() reading, immune to wall-clock jumps
+	last_heartbeat: float = field(default_factory=time.monotonic)
 	current_task: Optional[str] = None
 	metrics: Dict[str, Any] = field(default_factory=dict)
 
@@ -32,6 +44,7 @@ class TaskInfo:
 	end_time: Optional[datetime] = None
 	result: Optional[Dict[str, Any]] = None
 	error: Optional[str] = None
+	key: Optional[str] = None
 
 class DistributedExecutor:
 	"""Manages distributed task execution"""
@@ -42,31 +55,80 @@ class DistributedExecutor:
 		self.tasks: Dict[str, TaskInfo] = {}
 		self._task_queue = asyncio.Queue()
 		self._worker_lock = asyncio.Lock()
+		self._session: Optional[aiohttp.ClientSession] = None
+		# Idle worker ids per tool, so scheduling never scans every worker
+		self._idle_by_cap: Dict[str, Deque[str]] = defaultdict(deque)
+		self._busy: Set[str] = set()
+		# Tasks waiting on a capable worker, per tool, so they don't hold up other tools
+		self._parked: Dict[str, Deque[TaskInfo]] = defaultdict(deque)
+		# Dispatches still talking to a worker, kept so stop() can wait for them
+		self._inflight: Set[asyncio.Task] = set()
+		# Task id per input hash, in LRU order, so repeated submissions short-circuit
+		self._result_cache: OrderedDict[str, str] = OrderedDict()
+		# (deadline, worker id) min-heap; entries go stale when a heartbeat moves the deadline
+		self._deadlines: List[Tuple[float, str]] = []
+		self._wake_event = asyncio.Event()
 		self._setup_monitoring()
 
 	async def start(self):
 		"""Start distributed executor"""
+		# One pooled session keeps connections to each worker alive between tasks
+		self._session = aiohttp.ClientSession(
+			connector=aiohttp.TCPConnector(limit=0, limit_per_host=32, keepalive_timeout=75, ttl_dns_cache=300)
+		)
 		await self._start_worker_monitor()
 		await self._start_task_scheduler()
 
 	async def stop(self):
 		"""Stop distributed executor"""
-		# Cleanup tasks and notify workers
-		pass
+		# Cleanup tasks and notify workers; finishing dispatches can release parked
+		# tasks, so keep draining until nothing is left running
+		while self._inflight:
+			await asyncio.gather(*self._inflight, return_exceptions=True)
+		if self._session is not None:
+			await self._session.close()
+			self._session = None
 
 	async def submit_task(self, module: str, tool: str, params: Dict[str, Any]) -> str:
 		"""Submit task for distributed execution"""
+		key = hashlib.blake2b(
+			orjson.dumps((module, tool, params), option=orjson.OPT_SORT_KEYS, default=str),
+			digest_size=16
+		).hexdigest()
+		cached_id = self._lookup_task(key)
+		if cached_id is not None:
+			return cached_id
+		
 		task_id = f"{module}_{tool}_{datetime.now().timestamp()}"
 		task = TaskInfo(
 			id=task_id,
 			module=module,
 			tool=tool,
-			params=params
+			params=params,
+			key=key
 		)
 		self.tasks[task_id] = task
+		self._result_cache[key] = task_id
+		if len(self._result_cache) > RESULT_CACHE_SIZE:
+			self._result_cache.popitem(last=False)
 		await self._task_queue.put(task)
 		return task_id
 
+	def _lookup_task(self, key: str) -> Optional[str]:
+		"""Find a queued, running or recently completed task with the same inputs"""
+		task_id = self._result_cache.get(key)
+		task = self.tasks.get(task_id) if task_id else None
+		if task is None:
+			return None
+		if task.status == 'failed' or (
+			task.status == 'completed' and
+			(task.end_time is None or (datetime.now() - task.end_time).total_seconds() > RESULT_CACHE_TTL)
+		):
+			del self._result_cache[key]
+			return None
+		self._result_cache.move_to_end(key)
+		return task_id
+
 	async def get_task_result(self, task_id: str) -> Optional[Dict[str, Any]]:
 		"""Get task result"""
 		if task_id in self.tasks:
@@ -80,35 +142,75 @@ class DistributedExecutor:
 	async def register_worker(self, worker_id: str, address: str, capabilities: Set[str]):
 		"""Register new worker"""
 		async with self._worker_lock:
-			self.workers[worker_id] = WorkerInfo(
+			if worker_id in self.workers:
+				self._drop_idle(self.workers[worker_id])
+			worker = WorkerInfo(
 				id=worker_id,
 				address=address,
 				capabilities=capabilities
 			)
+			self.workers[worker_id] = worker
+			self._mark_idle(worker)
+			self._push_deadline(worker)
+			self._release_parked()
+
+	async def record_heartbeat(self, worker_id: str, metrics: Optional[Dict[str, Any]] = None):
+		"""Record a heartbeat from a worker, pushing back its liveness deadline"""
+		worker = self.workers.get(worker_id)
+		if worker is None:
+			return
+		worker.last_heartbeat = time.monotonic()
+		if metrics is not None:
+			worker.metrics = metrics
+		self._push_deadline(worker)
+
+	def _deadline(self, worker: WorkerInfo) -> float:
+		return worker.last_heartbeat + HEARTBEAT_TIMEOUT
+
+	def _push_deadline(self, worker: WorkerInfo) -> None:
+		heapq.heappush(self._deadlines, (self._deadline(worker), worker.id))
+		self._wake_event.set()
+
+	def _next_deadline_delay(self) -> Optional[float]:
+		"""Seconds until the earliest live worker deadline, or None if there are no workers"""
+		while self._deadlines:
+			deadline, worker_id = self._deadlines[0]
+			worker = self.workers.get(worker_id)
+			if worker is not None and self._deadline(worker) == deadline:
+				return max(0.0, deadline - time.monotonic())
+			heapq.heappop(self._deadlines)
+		return None
 
 	async def _start_worker_monitor(self):
 		"""Monitor worker health"""
 		while True:
 			try:
+				# Sleep until the nearest heartbeat deadline rather than polling;
+				# new workers and heartbeats wake us to recompute it
+				self._wake_event.clear()
+				try:
+					await asyncio.wait_for(self._wake_event.wait(), timeout=self._next_deadline_delay())
+					continue
+				except asyncio.TimeoutError:
+					pass
 				await self._check_workers()
-				await asyncio.sleep(30)  # Check every 30 seconds
 			except Exception as e:
 				self.logger.error(f"Error monitoring workers: {e}")
 
 	async def _check_workers(self):
 		"""Check worker health status"""
 		async with self._worker_lock:
-			current_time = datetime.now()
+			current_time = time.monotonic()
 			dead_workers = []
 			
 			for worker_id, worker in self.workers.items():
-				if (current_time - worker.last_heartbeat).total_seconds() > 60:
+				if current_time >= self._deadline(worker):
 					dead_workers.append(worker_id)
 					if worker.current_task:
 						await self._reschedule_task(worker.current_task)
 
 			for worker_id in dead_workers:
-				del self.workers[worker_id]
+				self._drop_idle(self.workers.pop(worker_id))
 
 	async def _start_task_scheduler(self):
 		"""Schedule tasks to workers"""
@@ -122,52 +224,102 @@ class DistributedExecutor:
 	async def _schedule_task(self, task: TaskInfo):
 		"""Schedule task to appropriate worker"""
 		async with self._worker_lock:
-			available_workers = [
-				w for w in self.workers.values()
-				if w.status == 'idle' and task.tool in w.capabilities
-			]
-			
-			if not available_workers:
-				await self._task_queue.put(task)
+			worker = self._take_idle(task.tool)
+			if worker is None:
+				# Park it and move on to the next task; _release_parked() hands it
+				# out once a capable worker frees up
+				self._parked[task.tool].append(task)
 				return
+			self._start_dispatch(worker, task)
 
-			worker = available_workers[0]
-			worker.status = 'busy'
-			worker.current_task = task.id
-			task.worker_id = worker.id
-			task.status = 'running'
-			task.start_time = datetime.now()
+	def _release_parked(self) -> None:
+		"""Hand parked tasks to any idle workers that can now run them"""
+		for tool in list(self._parked):
+			parked = self._parked[tool]
+			while parked:
+				worker = self._take_idle(tool)
+				if worker is None:
+					break
+				self._start_dispatch(worker, parked.popleft())
+			if not parked:
+				del self._parked[tool]
 
-			try:
-				await self._execute_on_worker(worker, task)
-			except Exception as e:
-				task.status = 'failed'
-				task.error = str(e)
-				worker.status = 'idle'
-				worker.current_task = None
+	def _start_dispatch(self, worker: WorkerInfo, task: TaskInfo) -> None:
+		"""Assign task to a claimed worker and run it in the background"""
+		worker.current_task = task.id
+		task.worker_id = worker.id
+		task.status = 'running'
+		task.start_time = datetime.now()
+
+		# Run the request in the background so the scheduler can hand out the next task
+		dispatch = asyncio.create_task(self._dispatch(worker, task))
+		self._inflight.add(dispatch)
+		dispatch.add_done_callback(self._inflight.discard)
+
+	async def _dispatch(self, worker: WorkerInfo, task: TaskInfo):
+		"""Execute task on worker, recording a failure on the task"""
+		try:
+			await self._execute_on_worker(worker, task)
+		except Exception as e:
+			task.status = 'failed'
+			task.error = str(e)
 
 	async def _execute_on_worker(self, worker: WorkerInfo, task: TaskInfo):
 		"""Execute task on worker"""
-		async with aiohttp.ClientSession() as session:
+		try:
+			async with self._session.post(
+				f"http://{worker.address}/execute",
+				json={
+					'task_id': task.id,
+					'module': task.module,
+					'tool': task.tool,
+					'params': task.params
+				}
+			) as response:
+				result = await response.json()
+				task.status = 'completed'
+				task.result = result
+				task.end_time = datetime.now()
+		except Exception as e:
+			raise Exception(f"Worker execution failed: {e}")
+		finally:
+			async with self._worker_lock:
+				if self.workers.get(worker.id) is worker:
+					self._mark_idle(worker)
+					self._release_parked()
+
+	def _take_idle(self, tool: str) -> Optional[WorkerInfo]:
+		"""Claim an idle worker that can run tool, or None if all of them are busy"""
+		idle = self._idle_by_cap.get(tool)
+		if not idle:
+			return None
+		worker = self.workers[idle.popleft()]
+		# The worker also waits in its other capabilities' queues
+		for cap in worker.capabilities:
+			if cap != tool:
+				self._idle_by_cap[cap].remove(worker.id)
+		worker.status = 'busy'
+		self._busy.add(worker.id)
+		return worker
+
+	def _mark_idle(self, worker: WorkerInfo) -> None:
+		"""Return a worker to the idle queue of every tool it supports"""
+		worker.status = 'idle'
+		worker.current_task = None
+		self._busy.discard(worker.id)
+		for cap in worker.capabilities:
+			self._idle_by_cap[cap].append(worker.id)
+
+	def _drop_idle(self, worker: WorkerInfo) -> None:
+		"""Forget a worker that is leaving, wherever it is queued"""
+		if worker.id in self._busy:
+			self._busy.discard(worker.id)
+			return
+		for cap in worker.capabilities:
 			try:
-				async with session.post(
-					f"http://{worker.address}/execute",
-					json={
-						'task_id': task.id,
-						'module': task.module,
-						'tool': task.tool,
-						'params': task.params
-					}
-				) as response:
-					result = await response.json()
-					task.status = 'completed'
-					task.result = result
-					task.end_time = datetime.now()
-			except Exception as e:
-				raise Exception(f"Worker execution failed: {e}")
-			finally:
-				worker.status = 'idle'
-				worker.current_task = None
+				self._idle_by_cap[cap].remove(worker.id)
+			except ValueError:
+				pass
 
 	async def _reschedule_task(self, task_id: str):
 		"""Reschedule failed task"""
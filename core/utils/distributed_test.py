@@ -0,0 +1,94 @@
+import pytest
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock
+from core.utils.distributed import DistributedExecutor, TaskInfo, HEARTBEAT_TIMEOUT
+
+@pytest.fixture
+def executor():
+	return DistributedExecutor(Mock())
+
+def mock_session(release: asyncio.Event, result=None):
+	"""aiohttp session whose responses are held back until release is set"""
+	async def json():
+		await release.wait()
+		return result or {'ok': True}
+	session = MagicMock()
+	session.post.return_value.__aenter__.return_value.json = AsyncMock(side_effect=json)
+	session.close = AsyncMock()
+	return session
+
+def make_task(tool: str) -> TaskInfo:
+	return TaskInfo(id=f"mod_{tool}", module='mod', tool=tool, params={})
+
+@pytest.mark.asyncio
+async def test_claim_and_return_across_capabilities(executor):
+	"""Claiming a worker for one tool takes it out of every tool's idle queue"""
+	await executor.register_worker('w1', 'w1:8000', {'nmap', 'httpx'})
+
+	worker = executor._take_idle('nmap')
+	assert worker.id == 'w1'
+	assert worker.status == 'busy'
+	assert executor._take_idle('httpx') is None
+
+	executor._mark_idle(worker)
+	assert worker.status == 'idle'
+	assert executor._take_idle('httpx') is worker
+
+@pytest.mark.asyncio
+async def test_busy_tool_does_not_block_other_tools(executor):
+	"""A task with no free worker is parked while later tasks still dispatch"""
+	release = asyncio.Event()
+	executor._session = mock_session(release)
+	await executor.register_worker('w1', 'w1:8000', {'nmap'})
+	await executor.register_worker('w2', 'w2:8000', {'httpx'})
+
+	first, parked, other = make_task('nmap'), make_task('nmap'), make_task('httpx')
+	parked.id = 'mod_nmap_2'
+	for task in (first, parked, other):
+		await asyncio.wait_for(executor._schedule_task(task), timeout=1)
+
+	assert first.worker_id == 'w1'
+	assert parked.status == 'pending'
+	assert other.worker_id == 'w2'
+
+	release.set()
+	await asyncio.wait_for(executor.stop(), timeout=1)
+	assert parked.worker_id == 'w1'
+	assert all(task.status == 'completed' for task in (first, parked, other))
+	assert not executor._parked
+
+@pytest.mark.asyncio
+async def test_worker_death_while_idle(executor):
+	"""An idle worker that misses its heartbeat is dropped from the idle queues"""
+	await executor.register_worker('w1', 'w1:8000', {'nmap', 'httpx'})
+	executor.workers['w1'].last_heartbeat = time.monotonic() - HEARTBEAT_TIMEOUT - 1
+
+	await executor._check_workers()
+
+	assert 'w1' not in executor.workers
+	assert executor._take_idle('nmap') is None
+	assert executor._take_idle('httpx') is None
+	assert executor._next_deadline_delay() is None
+
+@pytest.mark.asyncio
+async def test_stop_drains_inflight(executor):
+	"""stop() waits for running dispatches before closing the session"""
+	release = asyncio.Event()
+	session = mock_session(release, {'found': 3})
+	executor._session = session
+	await executor.register_worker('w1', 'w1:8000', {'nmap'})
+	task = make_task('nmap')
+	await executor._schedule_task(task)
+
+	stopping = asyncio.create_task(executor.stop())
+	await asyncio.sleep(0.01)
+	assert not stopping.done()
+	session.close.assert_not_awaited()
+
+	release.set()
+	await asyncio.wait_for(stopping, timeout=1)
+	assert task.status == 'completed'
+	assert task.result == {'found': 3}
+	assert executor.workers['w1'].status == 'idle'
+	session.close.assert_awaited_once()
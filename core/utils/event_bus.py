@@ -4,40 +4,55 @@ import logging
 
 class EventBus:
     def __init__(self):
-        self.handlers: Dict[str, List[Callable]] = {}
+        # Handlers are split by kind when they subscribe so emit needn't inspect them
+        self._sync: Dict[str, List[Callable]] = {}
+        self._async: Dict[str, List[Callable]] = {}
         self.logger = logging.getLogger(__name__)
 
     def subscribe(self, event: str, handler: Callable) -> None:
         """Subscribe a handler to an event"""
-        if event not in self.handlers:
-            self.handlers[event] = []
-        self.handlers[event].append(handler)
+        bucket = self._async if asyncio.iscoroutinefunction(handler) else self._sync
+        bucket.setdefault(event, []).append(handler)
         self.logger.debug(f"Subscribed handler to event: {event}")
 
     def unsubscribe(self, event: str, handler: Callable) -> None:
         """Unsubscribe a handler from an event"""
-        if event in self.handlers and handler in self.handlers[event]:
-            self.handlers[event].remove(handler)
-            self.logger.debug(f"Unsubscribed handler from event: {event}")
+        for bucket in (self._sync, self._async):
+            if event in bucket and handler in bucket[event]:
+                bucket[event].remove(handler)
+                self.logger.debug(f"Unsubscribed handler from event: {event}")
+                return
 
     async def emit(self, event: str, data: Any = None) -> None:
         """Emit an event with optional data"""
-        if event in self.handlers:
-            self.logger.debug(f"Emitting event: {event}")
-            tasks = []
-            for handler in self.handlers[event]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        tasks.append(asyncio.create_task(handler(data)))
-                    else:
-                        handler(data)
-                except Exception as e:
-                    self.logger.error(f"Error in event handler for {event}: {e}")
-            
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+        sync_handlers = self._sync.get(event)
+        async_handlers = self._async.get(event)
+        if not sync_handlers and not async_handlers:
+            return
+        
+        self.logger.debug(f"Emitting event: {event}")
+        if async_handlers and len(async_handlers) == 1 and not sync_handlers:
+            # A lone subscriber can be awaited directly without wrapping it in a task
+            try:
+                await async_handlers[0](data)
+            except Exception as e:
+                self.logger.error(f"Error in event handler for {event}: {e}")
+            return
+        
+        pending = [handler(data) for handler in async_handlers or ()]
+        for handler in sync_handlers or ():
+            try:
+                handler(data)
+            except Exception as e:
+                self.logger.error(f"Error in event handler for {event}: {e}")
+        
+        if pending:
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error in event handler for {event}: {result}")
 
     def clear(self) -> None:
         """Clear all event handlers"""
-        self.handlers.clear()
-        self.logger.debug("Cleared all event handlers") 
\ No newline at end of file
+        self._sync.clear()
+        self._async.clear()
+        self.logger.debug("Cleared all event handlers") 
@@ -4,10 +4,21 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 import asyncio
-from logging.handlers import RotatingFileHandler
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from rich.logging import RichHandler
 from rich.console import Console
-import json
+import orjson
+
+# Formatters hold no per-record state, so every handler can share these
+_CONSOLE_FORMATTER = logging.Formatter(
+    '%(asctime)s %(levelname)-8s %(message)s',
+    datefmt='[%y/%m/%d %H:%M:%S]'
+)
+_FILE_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 
 class AsyncRotatingFileHandler(RotatingFileHandler):
     """Async-compatible rotating file handler"""
@@ -22,19 +33,14 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.INFO)
         
-        # Create formatters
-        console_formatter = logging.Formatter(
-            '%(asctime)s %(levelname)-8s %(message)s',
-            datefmt='[%y/%m/%d %H:%M:%S]'
-        )
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        # Console handler, unless another Logger for this name already added one
+        if not any(
+            type(h) is logging.StreamHandler and h.stream is sys.stdout
+            for h in self.logger.handlers
+        ):
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(_CONSOLE_FORMATTER)
+            self.logger.addHandler(console_handler)
         
         # File handler (if log_dir is provided)
         if log_dir:
@@ -45,8 +51,40 @@ class Logger:
                 maxBytes=10*1024*1024,  # 10MB
                 backupCount=5
             )
-            file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            file_handler.setFormatter(_FILE_FORMATTER)
+            self._add_file_handler(file_handler)
+    
+    def _add_file_handler(self, handler: logging.FileHandler) -> None:
+        """Route a file handler through the logger's background queue listener, once per file"""
+        # File handlers live behind a queue so logging calls never wait on disk.
+        # The queue and listener hang off the logger itself so every Logger
+        # for the same name shares them
+        queue_handler = next((h for h in self.logger.handlers if isinstance(h, QueueHandler)), None)
+        if queue_handler is None:
+            queue_handler = QueueHandler(queue.SimpleQueue())
+            queue_handler.listener = None
+            self.logger.addHandler(queue_handler)
+            atexit.register(self.close)
+        
+        listener = getattr(queue_handler, 'listener', None)
+        existing = listener.handlers if listener is not None else ()
+        if any(getattr(h, 'baseFilename', None) == handler.baseFilename for h in existing):
+            # Already writing this file; a second handler would duplicate every record
+            handler.close()
+            return
+        
+        if listener is not None:
+            listener.stop()
+        queue_handler.listener = QueueListener(queue_handler.queue, *existing, handler, respect_handler_level=True)
+        queue_handler.listener.start()
+    
+    def close(self) -> None:
+        """Flush queued records to the file handlers and stop the listener"""
+        for handler in self.logger.handlers:
+            listener = getattr(handler, 'listener', None)
+            if isinstance(handler, QueueHandler) and listener is not None:
+                listener.stop()
+                handler.listener = None
     
     def addHandler(self, handler: logging.Handler) -> None:
         """Add a new handler to the logger"""
@@ -101,19 +139,15 @@ class Logger:
         log_dir = Path('logs')
         log_dir.mkdir(exist_ok=True)
         
-        file_handler = AsyncRotatingFileHandler(
+        file_handler = RotatingFileHandler(
             filename=log_dir / f'lleo_{datetime.now():%Y%m%d}.log',
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=5,
             encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)
-        
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        file_handler.setFormatter(_FILE_FORMATTER)
+        self._add_file_handler(file_handler)
 
     async def alog(self, level: int, msg: str, *args, **kwargs) -> None:
         """Async logging method"""
@@ -121,11 +155,9 @@ class Logger:
             record = self.logger.makeRecord(
                 self.logger.name, level, "(unknown file)", 0, msg, args, None
             )
-            for handler in self.logger.handlers:
-                if isinstance(handler, AsyncRotatingFileHandler):
-                    await handler.aemit(record)
-                else:
-                    handler.emit(record)
+            # handle() applies filters and each handler's level before emitting;
+            # file output is already off-loaded to the queue listener
+            self.logger.handle(record)
 
     async def adebug(self, msg: str, *args, **kwargs) -> None:
         """Async debug logging"""
@@ -150,4 +182,18 @@ class Logger:
     def log_dict(self, data: dict, level: str = 'info') -> None:
         """Log dictionary data with proper formatting"""
         log_func = getattr(self.logger, level.lower())
-        log_func(json.dumps(data, indent=2))
\ No newline at end of file
+        # Rich would otherwise scan the whole JSON blob for [markup] tags
+        log_func(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode(),
+            extra={'markup': False}
+        )
+
+def setup_logger(name: str = "LLEO", log_dir: Optional[Path] = None,
+                 verbose: bool = False, silent: bool = False) -> logging.Logger:
+    """Configure the shared LLEO logger and return the underlying logging.Logger"""
+    logger = Logger(name, log_dir)
+    if verbose:
+        logger.setLevel(logging.DEBUG)
+    elif silent:
+        logger.setLevel(logging.WARNING)
+    return logger.getLogger()
@@ -1,20 +1,24 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Set
+from collections import deque
 from datetime import datetime
 import psutil
 import asyncio
 import logging
+import os
 from pathlib import Path
 import json
-import aiofiles
+import orjson
 from dataclasses import asdict
+import threading
 import time
 
 @dataclass
 class ToolMetrics:
 	name: str
-	start_time: datetime
-	end_time: Optional[datetime] = None
+	# time.monotonic() readings; converted to wall-clock ISO strings when saved
+	start_time: float
+	end_time: Optional[float] = None
 	execution_time: float = 0.0
 	memory_usage: float = 0.0
 	cpu_usage: float = 0.0
@@ -41,8 +45,9 @@ class ResourceMetrics:
 
 @dataclass
 class ModuleMetrics:
-	start_time: str
-	end_time: Optional[str] = None
+	# time.monotonic() readings; converted to wall-clock ISO strings when reported
+	start_time: float
+	end_time: Optional[float] = None
 	duration: float = 0.0
 	peak_cpu_percent: float = 0.0
 	peak_memory_percent: float = 0.0
@@ -57,14 +62,27 @@ class PerformanceMonitor:
 		self.output_dir = output_dir / 'metrics'
 		self.output_dir.mkdir(parents=True, exist_ok=True)
 		self.tool_metrics: Dict[str, ToolMetrics] = {}
-		self.system_metrics: List[SystemMetrics] = []
+		# Keep a bounded history; the summary stats below cover every sample
+		self.system_metrics: Deque[SystemMetrics] = deque(maxlen=10_000)
+		self._first_system_metric: Optional[SystemMetrics] = None
+		self._peak_memory_percent = 0.0
+		self._cpu_percent_sum = 0.0
+		self._system_sample_count = 0
 		self.monitoring = False
 		self._monitor_task = None
 		self.interval = interval
 		self.monitoring_tasks = {}
 		self.metrics = {}
+		# Reported module metrics, rebuilt only after the module's metrics change
+		self._metrics_cache: Dict[str, Dict[str, Any]] = {}
+		self._metrics_dirty: Set[str] = set()
 		self.running = False
 		self._monitoring_lock = asyncio.Lock()
+		self._save_lock = asyncio.Lock()
+		# One psutil snapshot is shared by the system and module monitors per tick
+		self._snapshot_lock = threading.Lock()
+		self._snapshot: Dict[str, Any] = {}
+		self._snapshot_time = 0.0
 		
 		# Initialize process info
 		self.process = psutil.Process()
@@ -78,6 +96,8 @@ class PerformanceMonitor:
 	async def start_monitoring(self):
 		"""Start system monitoring"""
 		self.monitoring = True
+		# Prime the CPU counter so later non-blocking calls measure since this point
+		psutil.cpu_percent(interval=None)
 		self._monitor_task = asyncio.create_task(self._monitor_system())
 		self.logger.info("System monitoring started")
 
@@ -97,16 +117,9 @@ class PerformanceMonitor:
 		"""Monitor system metrics"""
 		while self.monitoring:
 			try:
-				metrics = SystemMetrics(
-					cpu_percent=psutil.cpu_percent(interval=1),
-					memory_percent=psutil.virtual_memory().percent,
-					disk_percent=psutil.disk_usage('/').percent,
-					network_io={
-						'bytes_sent': psutil.net_io_counters().bytes_sent,
-						'bytes_recv': psutil.net_io_counters().bytes_recv
-					}
-				)
-				self.system_metrics.append(metrics)
+				# psutil reads /proc synchronously, so keep it off the event loop
+				metrics = await asyncio.to_thread(self._sample_system)
+				self._record_system_metrics(metrics)
 				
 				# Check resource thresholds
 				if metrics.cpu_percent > 90:
@@ -116,25 +129,65 @@ class PerformanceMonitor:
 				if metrics.disk_percent > 90:
 					self.logger.warning(f"High disk usage: {metrics.disk_percent}%")
 				
-				await asyncio.sleep(5)  # Monitor every 5 seconds
+				await asyncio.sleep(self.interval)
 				
 			except Exception as e:
 				self.logger.error(f"Error monitoring system: {e}")
-				await asyncio.sleep(5)
+				await asyncio.sleep(self.interval)
+
+	def _record_system_metrics(self, metrics: SystemMetrics) -> None:
+		"""Store a system sample and fold it into the running summary"""
+		if self._first_system_metric is None:
+			self._first_system_metric = metrics
+		self.system_metrics.append(metrics)
+		self._peak_memory_percent = max(self._peak_memory_percent, metrics.memory_percent)
+		self._cpu_percent_sum += metrics.cpu_percent
+		self._system_sample_count += 1
+
+	def _sample_psutil(self) -> Dict[str, Any]:
+		"""Read every psutil counter at most once per half interval and share the result"""
+		with self._snapshot_lock:
+			now = time.monotonic()
+			if self._snapshot and now - self._snapshot_time < self.interval / 2:
+				return self._snapshot
+			self._snapshot = {
+				'cpu_percent': psutil.cpu_percent(interval=None),
+				'memory': psutil.virtual_memory(),
+				'disk': psutil.disk_usage('/'),
+				'net_io': psutil.net_io_counters(),
+				# open_files walks /proc/<pid>/fd, so it is worth sharing too
+				'open_files': len(self.process.open_files())
+			}
+			self._snapshot_time = now
+			return self._snapshot
+
+	def _sample_system(self) -> SystemMetrics:
+		"""Take one system sample without blocking on the CPU measurement"""
+		snapshot = self._sample_psutil()
+		net_io = snapshot['net_io']
+		return SystemMetrics(
+			cpu_percent=snapshot['cpu_percent'],
+			memory_percent=snapshot['memory'].percent,
+			disk_percent=snapshot['disk'].percent,
+			network_io={
+				'bytes_sent': net_io.bytes_sent,
+				'bytes_recv': net_io.bytes_recv
+			}
+		)
 
 	def start_tool_monitoring(self, tool_name: str):
 		"""Start monitoring a specific tool"""
 		self.tool_metrics[tool_name] = ToolMetrics(
 			name=tool_name,
-			start_time=datetime.now()
+			start_time=time.monotonic()
 		)
 
 	def stop_tool_monitoring(self, tool_name: str, success: bool = True):
 		"""Stop monitoring a specific tool"""
 		if tool_name in self.tool_metrics:
 			metrics = self.tool_metrics[tool_name]
-			metrics.end_time = datetime.now()
-			metrics.execution_time = (metrics.end_time - metrics.start_time).total_seconds()
+			metrics.end_time = time.monotonic()
+			metrics.execution_time = metrics.end_time - metrics.start_time
 			if success:
 				metrics.success_count += 1
 			else:
@@ -149,34 +202,21 @@ class PerformanceMonitor:
 		"""Save metrics to file"""
 		try:
 			metrics_file = self.output_dir / f'metrics_{datetime.now():%Y%m%d_%H%M%S}.json'
-			metrics = {
-				'system_metrics': [
-					{
-						'timestamp': m.timestamp.isoformat(),
-						'cpu_percent': m.cpu_percent,
-						'memory_percent': m.memory_percent,
-						'disk_percent': m.disk_percent,
-						'network_io': m.network_io
+			# orjson serialises the dataclasses and their datetimes natively
+			payload = orjson.dumps(
+				{
+					'system_metrics': list(self.system_metrics),
+					'tool_metrics': {
+						name: self._with_wall_clock(asdict(m)) for name, m in self.tool_metrics.items()
 					}
-					for m in self.system_metrics
-				],
-				'tool_metrics': {
-					name: {
-						'start_time': m.start_time.isoformat(),
-						'end_time': m.end_time.isoformat() if m.end_time else None,
-						'execution_time': m.execution_time,
-						'memory_usage': m.memory_usage,
-						'cpu_usage': m.cpu_usage,
-						'success_count': m.success_count,
-						'error_count': m.error_count,
-						'retries': m.retries
-					}
-					for name, m in self.tool_metrics.items()
-				}
-			}
-			
-			async with aiofiles.open(metrics_file, 'w') as f:
-				await f.write(json.dumps(metrics, indent=4))
+				},
+				option=orjson.OPT_INDENT_2
+			)
+			# Write to a temp file and rename it into place so overlapping saves never tear the JSON
+			tmp_file = metrics_file.with_suffix('.json.tmp')
+			async with self._save_lock:
+				await asyncio.to_thread(tmp_file.write_bytes, payload)
+				await asyncio.to_thread(os.replace, tmp_file, metrics_file)
 			
 		except Exception as e:
 			self.logger.error(f"Error saving metrics: {e}")
@@ -191,12 +231,16 @@ class PerformanceMonitor:
 				'data_processed_mb': 0
 			}
 		
-		first_metric = self.system_metrics[0]
+		first_metric = self._first_system_metric or self.system_metrics[0]
 		last_metric = self.system_metrics[-1]
 		duration = (last_metric.timestamp - first_metric.timestamp).total_seconds()
 		
-		peak_memory = max(m.memory_percent for m in self.system_metrics)
-		avg_cpu = sum(m.cpu_percent for m in self.system_metrics) / len(self.system_metrics)
+		if self._system_sample_count:
+			peak_memory = self._peak_memory_percent
+			avg_cpu = self._cpu_percent_sum / self._system_sample_count
+		else:
+			peak_memory = max(m.memory_percent for m in self.system_metrics)
+			avg_cpu = sum(m.cpu_percent for m in self.system_metrics) / len(self.system_metrics)
 		
 		# Calculate data processed from network IO
 		initial_bytes = first_metric.network_io.get('bytes_recv', 0)
@@ -243,11 +287,8 @@ class PerformanceMonitor:
 
 	def _is_healthy(self, metrics: SystemMetrics) -> bool:
 		"""Check if system metrics are within healthy ranges"""
-		return (
-			metrics.cpu_percent < 90 and
-			metrics.memory_percent < 90 and
-			metrics.disk_percent < 90
-		)
+		# Every threshold is the same, so one comparison against the worst metric covers all three
+		return max(metrics.cpu_percent, metrics.memory_percent, metrics.disk_percent) < 90
 
 	async def start_monitoring_module(self, module_name: str) -> None:
 		"""Start monitoring a module's performance"""
@@ -256,8 +297,9 @@ class PerformanceMonitor:
 				return
 			
 			self.metrics[module_name] = ModuleMetrics(
-				start_time=datetime.now().isoformat()
+				start_time=time.monotonic()
 			)
+			self._metrics_dirty.add(module_name)
 			
 			# Create monitoring task
 			task = asyncio.create_task(self._monitor_module(module_name))
@@ -281,18 +323,16 @@ class PerformanceMonitor:
 			# Update final metrics
 			if module_name in self.metrics:
 				metrics = self.metrics[module_name]
-				metrics.end_time = datetime.now().isoformat()
-				if metrics.start_time:
-					start = datetime.fromisoformat(metrics.start_time)
-					end = datetime.fromisoformat(metrics.end_time)
-					metrics.duration = (end - start).total_seconds()
+				metrics.end_time = time.monotonic()
+				metrics.duration = metrics.end_time - metrics.start_time
+				self._metrics_dirty.add(module_name)
 			
 			self.logger.debug(f"Stopped monitoring {module_name}")
 
 	async def _monitor_module(self, module_name: str) -> None:
 		"""Monitor module performance metrics"""
-		cpu_samples = []
-		memory_samples = []
+		cpu_sum = memory_sum = 0.0
+		sample_count = 0
 		start_net_io = psutil.net_io_counters()
 		
 		try:
@@ -312,13 +352,13 @@ class PerformanceMonitor:
 					metrics.memory_percent
 				)
 				
-				# Collect samples for averages
-				cpu_samples.append(metrics.cpu_percent)
-				memory_samples.append(metrics.memory_percent)
-				
-				# Calculate averages
-				module_metrics.avg_cpu_percent = sum(cpu_samples) / len(cpu_samples)
-				module_metrics.avg_memory_percent = sum(memory_samples) / len(memory_samples)
+				# Keep running averages rather than every sample
+				cpu_sum += metrics.cpu_percent
+				memory_sum += metrics.memory_percent
+				sample_count += 1
+				module_metrics.avg_cpu_percent = cpu_sum / sample_count
+				module_metrics.avg_memory_percent = memory_sum / sample_count
+				self._metrics_dirty.add(module_name)
 				
 				# Check resource thresholds
 				await self._check_resource_thresholds(metrics, module_name)
@@ -334,27 +374,25 @@ class PerformanceMonitor:
 			)
 			if module_name in self.metrics:
 				self.metrics[module_name].total_network_bytes = total_bytes
+				self._metrics_dirty.add(module_name)
 		
 		except Exception as e:
 			self.logger.error(f"Error monitoring {module_name}: {e}")
 			if module_name in self.metrics:
 				self.metrics[module_name].error_count += 1
+				self._metrics_dirty.add(module_name)
 
 	async def _get_resource_metrics(self) -> ResourceMetrics:
 		"""Get current resource metrics"""
 		try:
-			cpu_percent = psutil.cpu_percent(interval=0.1)
-			memory = psutil.virtual_memory()
-			disk = psutil.disk_usage('/')
-			open_files = len(self.process.open_files())
-			net_io = psutil.net_io_counters()._asdict()
+			snapshot = await asyncio.to_thread(self._sample_psutil)
 			
 			return ResourceMetrics(
-				cpu_percent=cpu_percent,
-				memory_percent=memory.percent,
-				disk_usage_percent=disk.percent,
-				open_files=open_files,
-				network_io_counters=net_io,
+				cpu_percent=snapshot['cpu_percent'],
+				memory_percent=snapshot['memory'].percent,
+				disk_usage_percent=snapshot['disk'].percent,
+				open_files=snapshot['open_files'],
+				network_io_counters=snapshot['net_io']._asdict(),
 				timestamp=datetime.now().isoformat()
 			)
 			
@@ -379,15 +417,30 @@ class PerformanceMonitor:
 			warning_msg = f"Resource warning for {module_name}: " + ", ".join(warnings)
 			self.logger.warning(warning_msg)
 
+	def _with_wall_clock(self, data: Dict[str, Any]) -> Dict[str, Any]:
+		"""Replace monotonic start and end times in a metrics dict with ISO wall-clock times"""
+		offset = time.time() - time.monotonic()
+		for key in ('start_time', 'end_time'):
+			if data[key] is not None:
+				data[key] = datetime.fromtimestamp(data[key] + offset).isoformat()
+		return data
+
+	def _module_metrics_dict(self, metrics: ModuleMetrics) -> Dict[str, Any]:
+		"""Report module metrics with their monotonic timestamps as ISO wall-clock times"""
+		return self._with_wall_clock(asdict(metrics))
+
 	def get_module_metrics(self, module_name: str) -> Optional[Dict[str, Any]]:
 		"""Get metrics for a specific module"""
-		if module_name in self.metrics:
-			return asdict(self.metrics[module_name])
-		return None
+		if module_name not in self.metrics:
+			return None
+		if module_name in self._metrics_dirty or module_name not in self._metrics_cache:
+			self._metrics_cache[module_name] = self._module_metrics_dict(self.metrics[module_name])
+			self._metrics_dirty.discard(module_name)
+		return self._metrics_cache[module_name]
 
 	def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
 		"""Get metrics for all modules"""
-		return {name: asdict(metrics) for name, metrics in self.metrics.items()}
+		return {name: self.get_module_metrics(name) for name in self.metrics}
 
 	async def save_metrics(self, output_dir: Path) -> None:
 		"""Save metrics to file"""
@@ -0,0 +1,52 @@
+from typing import Any, AnyStr, Iterator, List
+
+import orjson
+
+
+def iter_ndjson(buf: AnyStr) -> Iterator[AnyStr]:
+    """Yield the non-blank, stripped records of an NDJSON buffer
+
+    Scans the buffer for newlines directly instead of materializing a list
+    of lines with splitlines(), so large tool outputs are walked in a single
+    pass with no intermediate list. Blank and whitespace-only lines are
+    skipped here so callers don't need their own emptiness checks. Works on
+    both bytes and str buffers.
+    """
+    newline = b'\n' if isinstance(buf, bytes) else '\n'
+    start = 0
+    end = len(buf)
+    while start < end:
+        index = buf.find(newline, start)
+        if index < 0:
+            index = end
+        line = buf[start:index].strip()
+        if line:
+            yield line
+        start = index + 1
+
+
+def loads_ndjson(buf: AnyStr) -> List[Any]:
+    """Parse an NDJSON buffer into a list of records
+
+    Homogeneous tool output is decoded in a single orjson call by joining
+    the records into one JSON array, avoiding a parser round trip per line.
+    If any record is malformed the buffer is re-parsed line by line and the
+    bad records are skipped.
+    """
+    lines = list(iter_ndjson(buf))
+    if not lines:
+        return []
+    if isinstance(buf, bytes):
+        joined = b'[' + b','.join(lines) + b']'
+    else:
+        joined = '[' + ','.join(lines) + ']'
+    try:
+        return orjson.loads(joined)
+    except orjson.JSONDecodeError:
+        records = []
+        for line in lines:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+        return records
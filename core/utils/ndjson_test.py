@@ -0,0 +1,40 @@
+import pytest
+from .ndjson import iter_ndjson, loads_ndjson
+
+@pytest.mark.parametrize('buf', [
+    b'{"a": 1}\n\n  \n{"b": 2}\n',
+    '{"a": 1}\n\n  \n{"b": 2}\n',
+])
+def test_iter_ndjson_skips_blank_lines(buf):
+    """Blank and whitespace-only lines are not yielded"""
+    assert len(list(iter_ndjson(buf))) == 2
+
+def test_iter_ndjson_trailing_line_without_newline():
+    """The last record is kept even without a closing newline"""
+    assert list(iter_ndjson(b'{"a": 1}\n{"b": 2}')) == [b'{"a": 1}', b'{"b": 2}']
+
+def test_iter_ndjson_crlf():
+    """CRLF line endings are stripped from each record"""
+    assert list(iter_ndjson(b'{"a": 1}\r\n{"b": 2}\r\n')) == [b'{"a": 1}', b'{"b": 2}']
+
+def test_iter_ndjson_empty():
+    """Empty and blank buffers yield nothing"""
+    assert list(iter_ndjson(b'')) == []
+    assert list(iter_ndjson('\n\n')) == []
+
+@pytest.mark.parametrize('buf', [
+    b'{"a": 1}\r\n\r\n{"b": 2}',
+    '{"a": 1}\r\n\r\n{"b": 2}',
+])
+def test_loads_ndjson(buf):
+    """Well-formed records are parsed in order for bytes and str buffers"""
+    assert loads_ndjson(buf) == [{'a': 1}, {'b': 2}]
+
+def test_loads_ndjson_empty():
+    """A buffer with no records parses to an empty list"""
+    assert loads_ndjson(b'\n \n') == []
+
+def test_loads_ndjson_malformed_record_mid_batch():
+    """A malformed record is skipped without losing the records around it"""
+    buf = b'{"a": 1}\n{"b": \n[INF] progress banner\n{"c": 3}\n'
+    assert loads_ndjson(buf) == [{'a': 1}, {'c': 3}]
@@ -1,10 +1,15 @@
 import asyncio
 import time
-from typing import Optional, Dict, List
-from dataclasses import dataclass
+import weakref
+from typing import Optional, Dict, Deque
+from collections import deque
+from dataclasses import dataclass, field
 import logging
 from datetime import datetime, timedelta
 
+# Limiters with monitoring enabled, all swept by one shared task
+_ALL_LIMITERS: 'weakref.WeakSet[RateLimiter]' = weakref.WeakSet()
+
 @dataclass
 class RateLimitConfig:
     calls_per_second: int = 10
@@ -17,13 +22,17 @@ class RateLimitConfig:
 class RateLimitStats:
     total_requests: int = 0
     throttled_requests: int = 0
-    last_reset: float = time.monotonic()
-    intervals: List[float] = None
-
-    def __post_init__(self):
-        self.intervals = []
+    last_reset: float = field(default_factory=time.monotonic)
+    # Gaps between recent successful acquires, bounded so long runs don't grow it
+    intervals: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
 
 class RateLimiter:
+    _monitor_task: Optional[asyncio.Task] = None
+    # Loop the shared task runs on; a task orphaned by a closed loop never reports done
+    _monitor_loop: Optional[asyncio.AbstractEventLoop] = None
+    # Set by acquire() when a monitored limiter crosses the throttle threshold
+    _warn_event: Optional[asyncio.Event] = None
+
     def __init__(self, calls_per_second: int = 10, burst_size: Optional[int] = None):
         self.config = RateLimitConfig(
             calls_per_second=calls_per_second,
@@ -31,41 +40,75 @@ class RateLimiter:
         )
         self.tokens = self.config.burst_size
         self.last_update = time.monotonic()
-        self.lock = asyncio.Lock()
+        self._last_ts: Optional[float] = None
         self.logger = logging.getLogger('RateLimiter')
         self.stats = RateLimitStats()
-        self._monitoring_task = None
+        self._finalizer: Optional[weakref.finalize] = None
 
     async def start_monitoring(self):
-        """Start monitoring task"""
-        if not self._monitoring_task:
-            self._monitoring_task = asyncio.create_task(self._monitor_usage())
+        """Register with the shared monitoring task, starting it if needed"""
+        _ALL_LIMITERS.add(self)
+        if self._finalizer is None:
+            # Collection drops the limiter from the WeakSet silently, so wake the
+            # monitor to notice when it was the last one
+            self._finalizer = weakref.finalize(self, RateLimiter._wake_monitor)
+        loop = asyncio.get_running_loop()
+        task = RateLimiter._monitor_task
+        if task is None or task.done() or RateLimiter._monitor_loop is not loop:
+            RateLimiter._monitor_loop = loop
+            RateLimiter._warn_event = asyncio.Event()
+            RateLimiter._monitor_task = loop.create_task(RateLimiter._monitor_usage())
 
     async def stop_monitoring(self):
-        """Stop monitoring task"""
-        if self._monitoring_task:
-            self._monitoring_task.cancel()
-            try:
-                await self._monitoring_task
-            except asyncio.CancelledError:
-                pass
-            self._monitoring_task = None
+        """Unregister from monitoring, stopping the shared task once nothing is left"""
+        _ALL_LIMITERS.discard(self)
+        task = RateLimiter._monitor_task
+        if task and not _ALL_LIMITERS:
+            RateLimiter._wake_monitor()
+            # A task from an earlier, closed loop can't be awaited here; just forget it
+            if RateLimiter._monitor_loop is asyncio.get_running_loop():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            RateLimiter._monitor_task = None
+            RateLimiter._monitor_loop = None
+            RateLimiter._warn_event = None
 
-    async def _monitor_usage(self):
-        """Monitor rate limit usage"""
+    @staticmethod
+    def _wake_monitor():
+        """Wake the shared monitor from any thread so it can exit once no limiter is left"""
+        loop, event = RateLimiter._monitor_loop, RateLimiter._warn_event
+        if loop is None or event is None or loop.is_closed():
+            return
+        # Finalizers can run on whichever thread triggers collection
+        loop.call_soon_threadsafe(lambda: _ALL_LIMITERS or event.set())
+
+    @staticmethod
+    async def _monitor_usage():
+        """Warn about registered limiters whenever one of them starts throttling heavily"""
+        # Sleeps on the event while idle instead of polling. The event is also
+        # set when the last limiter goes away, which ends the task
+        event = RateLimiter._warn_event
         while True:
-            await asyncio.sleep(60)  # Monitor every minute
-            now = time.monotonic()
-            if now - self.stats.last_reset >= 3600:  # Reset stats every hour
-                self._reset_stats()
-            
-            if self.stats.throttled_requests > 0:
-                throttle_rate = self.stats.throttled_requests / self.stats.total_requests
-                if throttle_rate > 0.2:  # More than 20% requests throttled
-                    self.logger.warning(
-                        f"High throttle rate: {throttle_rate:.2%}. "
-                        f"Consider adjusting rate limits."
-                    )
+            await event.wait()
+            event.clear()
+            if not _ALL_LIMITERS:
+                break
+            for limiter in list(_ALL_LIMITERS):
+                limiter._check_usage()
+            await asyncio.sleep(60)  # Cooldown so warnings repeat at most once a minute
+
+    def _check_usage(self):
+        """Warn about a high throttle rate"""
+        if self.stats.throttled_requests > 0:
+            throttle_rate = self.stats.throttled_requests / self.stats.total_requests
+            if throttle_rate > 0.2:  # More than 20% requests throttled
+                self.logger.warning(
+                    f"High throttle rate: {throttle_rate:.2%}. "
+                    f"Consider adjusting rate limits."
+                )
 
     def _reset_stats(self):
         """Reset monitoring statistics"""
@@ -73,46 +116,51 @@ class RateLimiter:
 
     async def acquire(self, tokens: int = 1, retry: bool = True) -> bool:
         """Acquire tokens respecting rate limits with retry support"""
+        if time.monotonic() - self.stats.last_reset >= 3600:  # Reset stats every hour
+            self._reset_stats()
         self.stats.total_requests += 1
         
-        for attempt in range(self.config.max_retries if retry else 1):
+        attempts = self.config.max_retries if retry else 1
+        for attempt in range(attempts):
             try:
-                async with self.lock:
-                    await self._add_new_tokens()
-                    
-                    if self.tokens >= tokens:
-                        self.tokens -= tokens
-                        if self.stats.intervals:
-                            self.stats.intervals.append(
-                                time.monotonic() - self.stats.intervals[-1]
-                            )
-                        else:
-                            self.stats.intervals.append(time.monotonic())
-                        return True
-                    
-                    wait_time = self._time_to_tokens(tokens)
-                    if wait_time > 0:
-                        self.stats.throttled_requests += 1
-                        if attempt < self.config.max_retries - 1:
-                            await asyncio.sleep(min(wait_time, self.config.retry_delay))
-                            continue
-                        
-                        self.logger.warning(
-                            f"Rate limit exceeded. "
-                            f"Required tokens: {tokens}, "
-                            f"Available: {self.tokens:.2f}"
-                        )
-                        return False
-                    
+                # The bucket lives on one event loop and nothing from the refill
+                # to the deduction yields, so the update is atomic without a lock
+                self._add_new_tokens()
+                
+                if self.tokens >= tokens:
                     self.tokens -= tokens
+                    now = time.monotonic()
+                    if self._last_ts is not None:
+                        self.stats.intervals.append(now - self._last_ts)
+                    self._last_ts = now
                     return True
+                
+                wait_time = self._time_to_tokens(tokens)
+                self.stats.throttled_requests += 1
+                event = RateLimiter._warn_event
+                if (event is not None and not event.is_set()
+                        and self.stats.throttled_requests / self.stats.total_requests > 0.2
+                        and self in _ALL_LIMITERS
+                        and RateLimiter._monitor_loop is asyncio.get_running_loop()):
+                    event.set()
+                if attempt == attempts - 1:
+                    self.logger.warning(
+                        f"Rate limit exceeded. "
+                        f"Required tokens: {tokens}, "
+                        f"Available: {self.tokens:.2f}"
+                    )
+                    return False
+                
+                # Other waiters can take tokens as they refill while this one sleeps
+                await asyncio.sleep(min(wait_time, self.config.retry_delay))
                     
             except Exception as e:
                 self.logger.error(f"Error acquiring tokens: {e}")
-                if attempt == self.config.max_retries - 1:
+                if attempt == attempts - 1:
                     return False
+        return False
 
-    async def _add_new_tokens(self) -> None:
+    def _add_new_tokens(self) -> None:
         """Add new tokens based on elapsed time with burst handling"""
         now = time.monotonic()
         time_passed = now - self.last_update
@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import patch
+from . import rate_limiter
+from .rate_limiter import RateLimiter
+
+class FakeClock:
+    """Stands in for the module's time so refills depend only on advance()"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch.object(rate_limiter, 'time', clock):
+        yield clock
+
+@pytest.fixture
+def sleeps(clock):
+    """Record retry sleeps, advancing the fake clock instead of waiting"""
+    calls = []
+    async def fake_sleep(delay):
+        calls.append(delay)
+        clock.advance(delay)
+    with patch.object(rate_limiter.asyncio, 'sleep', fake_sleep):
+        yield calls
+
+def test_refill(clock):
+    """Tokens refill with elapsed time, faster when low, and never exceed the burst size"""
+    limiter = RateLimiter(calls_per_second=10, burst_size=10)
+    limiter.tokens = 0
+
+    clock.advance(0.2)
+    limiter._add_new_tokens()
+    assert limiter.tokens == pytest.approx(3.0)  # 0.2s * 10/s * 1.5 recovery boost
+
+    clock.advance(0.2)
+    limiter._add_new_tokens()
+    assert limiter.tokens == pytest.approx(6.0)  # Over half full, so no boost
+
+    clock.advance(10)
+    limiter._add_new_tokens()
+    assert limiter.tokens == 10
+
+@pytest.mark.asyncio
+async def test_throttling(clock, sleeps):
+    """Requests beyond the burst are refused and counted as throttled"""
+    limiter = RateLimiter(calls_per_second=10, burst_size=2)
+
+    assert await limiter.acquire(retry=False)
+    assert await limiter.acquire(retry=False)
+    assert not await limiter.acquire(retry=False)
+
+    stats = limiter.get_stats()
+    assert stats['total_requests'] == 3
+    assert stats['throttled_requests'] == 1
+    assert stats['throttle_rate'] == pytest.approx(1 / 3)
+    assert sleeps == []
+
+@pytest.mark.asyncio
+async def test_max_retries_exhausted(clock):
+    """An acquire that never gets tokens gives up after max_retries attempts"""
+    limiter = RateLimiter(calls_per_second=10, burst_size=1)
+    limiter.tokens = 0
+    calls = []
+    async def frozen_sleep(delay):
+        calls.append(delay)  # Time stands still, so nothing refills
+    with patch.object(rate_limiter.asyncio, 'sleep', frozen_sleep):
+        assert not await limiter.acquire(tokens=5)
+
+    assert limiter.stats.throttled_requests == limiter.config.max_retries
+    assert len(calls) == limiter.config.max_retries - 1
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_refill(clock, sleeps):
+    """A retry sleeps no longer than retry_delay and succeeds once tokens refill"""
+    limiter = RateLimiter(calls_per_second=10, burst_size=10)
+    limiter.tokens = 0
+
+    assert await limiter.acquire(tokens=2)
+    assert sleeps == [pytest.approx(0.2)]
+
+    limiter.tokens = 0
+    assert await limiter.acquire(tokens=10)
+    assert sleeps[1] == limiter.config.retry_delay
+
+@pytest.mark.asyncio
+async def test_intervals_record_gaps(clock):
+    """Only gaps between successful acquires are recorded, capped at the deque length"""
+    limiter = RateLimiter(calls_per_second=1000, burst_size=1000)
+
+    assert await limiter.acquire()
+    clock.advance(0.5)
+    assert await limiter.acquire()
+    clock.advance(1.0)
+    assert await limiter.acquire()
+    limiter.tokens = 0
+    assert not await limiter.acquire(tokens=2000, retry=False)
+
+    assert list(limiter.stats.intervals) == [pytest.approx(0.5), pytest.approx(1.0)]
+    assert limiter.stats.intervals.maxlen == 1024
@@ -1,18 +1,23 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, Optional, List, Any
 from pathlib import Path
 import os
 import yaml
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+import hashlib
 from dataclasses_json import dataclass_json
 import logging
 from dotenv import load_dotenv
 import json
 import re
 
+# libyaml's C loader is much faster; PyYAML may be built without it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Derived Fernet per (salt, key); PBKDF2 is deterministic and deliberately slow
+_FERNET_CACHE: Dict[tuple, Fernet] = {}
+
 @dataclass_json
 @dataclass
 class ToolConfig:
@@ -24,6 +29,7 @@ class ToolConfig:
 	burst_size: int = 10
 	max_memory_percent: int = 80
 	max_disk_percent: int = 90
+	per_target_timeout: int = 1800
 
 @dataclass_json
 @dataclass
@@ -50,6 +56,7 @@ class SecurityConfig:
 	encrypt_results: bool = False
 	encryption_key: str = ""
 	sandbox_external_tools: bool = True
+	verify_tls: bool = True
 	max_file_size_mb: int = 100
 
 @dataclass
@@ -57,6 +64,7 @@ class PerformanceConfig:
 	cache_results: bool = True
 	cache_ttl: int = 3600
 	max_memory_percent: int = 80
+	bloom_dedupe: bool = False
 
 @dataclass_json
 @dataclass
@@ -70,9 +78,39 @@ class SecureConfig:
 	performance: PerformanceConfig = field(default_factory=PerformanceConfig)
 	modules: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
+_SECTIONS = {
+	'tools': ToolConfig,
+	'wordlists': WordlistConfig,
+	'output': OutputConfig,
+	'security': SecurityConfig,
+	'performance': PerformanceConfig,
+}
+# Field names resolved once, rather than per load as dataclasses_json does
+_FIELD_NAMES = {
+	cls: frozenset(f.name for f in fields(cls))
+	for cls in (SecureConfig, *_SECTIONS.values())
+}
+
+def _build_config(data: Optional[Dict[str, Any]]) -> SecureConfig:
+	"""Build a SecureConfig from parsed YAML, ignoring unknown and null keys"""
+	kwargs = {}
+	for name, value in (data or {}).items():
+		if name not in _FIELD_NAMES[SecureConfig] or value is None:
+			continue
+		section = _SECTIONS.get(name)
+		if section is not None and isinstance(value, dict):
+			names = _FIELD_NAMES[section]
+			value = section(**{k: v for k, v in value.items() if k in names})
+		kwargs[name] = value
+	return SecureConfig(**kwargs)
+
 class ConfigManager:
 	def __init__(self, config_file: Optional[str] = None):
 		self.config_file = config_file or "config/config.yml"
+		self._cache_key: Optional[tuple] = None
+		self._cache_val: Optional[SecureConfig] = None
+		# service -> (stored key, decrypted key), kept in memory only
+		self._decrypted: Dict[str, tuple] = {}
 		self.config = self._load_config()
 		self._validate_config()
 
@@ -85,9 +123,15 @@ class ConfigManager:
 	def _load_config(self) -> SecureConfig:
 		"""Load configuration from file"""
 		try:
+			st = os.stat(self.config_file)
+			cache_key = (self.config_file, st.st_mtime_ns)
+			if cache_key == self._cache_key:
+				return self._cache_val
 			with open(self.config_file) as f:
-				yaml_config = yaml.safe_load(f)
-			return SecureConfig.from_dict(yaml_config)
+				yaml_config = yaml.load(f, Loader=_YAML_LOADER)
+			config = _build_config(yaml_config)
+			self._cache_key, self._cache_val = cache_key, config
+			return config
 		except Exception as e:
 			logging.error(f"Error loading config: {e}")
 			raise
@@ -104,11 +148,12 @@ class ConfigManager:
 		output_dir = Path(self.config.output.directory)
 		output_dir.mkdir(parents=True, exist_ok=True)
 
-		# Validate API keys from environment
-		for key_name, key_value in self.config.api_keys.items():
-			env_key = f"LLEO_{key_name.upper()}_KEY"
-			if os.getenv(env_key):
-				self.config.api_keys[key_name] = os.getenv(env_key)
+		# Environment overrides for API keys, one lookup per key
+		env = os.environ
+		self.config.api_keys = {
+			name: env.get(f"LLEO_{name.upper()}_KEY") or value
+			for name, value in self.config.api_keys.items()
+		}
 
 	def get(self, key: str, default: Any = None) -> Any:
 		"""Get configuration value with default"""
@@ -122,6 +167,9 @@ class ConfigManager:
 		try:
 			old_config = self.config
 			self.config = self._load_config()
+			if self.config is old_config:
+				# File unchanged since the last load
+				return True
 			self._validate_config()
 			return True
 		except Exception as e:
@@ -142,16 +190,17 @@ class ConfigManager:
 					f.write(f'LLEO_ENCRYPTION_KEY={key}\n')
 					f.write(f'LLEO_SALT={salt}\n')
 			
-			kdf = PBKDF2HMAC(
-				algorithm=hashes.SHA256(),
-				length=32,
-				salt=base64.b64decode(salt) if isinstance(salt, str) else salt,
-				iterations=100000,
-			)
-			
+			salt_bytes = base64.b64decode(salt) if isinstance(salt, str) else salt
 			key_bytes = base64.b64decode(key) if isinstance(key, str) else key
-			derived_key = base64.urlsafe_b64encode(kdf.derive(key_bytes))
-			self.fernet = Fernet(derived_key)
+			cache_key = (salt_bytes, key_bytes)
+			if cache_key in _FERNET_CACHE:
+				self.fernet = _FERNET_CACHE[cache_key]
+				return
+			
+			derived_key = base64.urlsafe_b64encode(
+				hashlib.pbkdf2_hmac('sha256', key_bytes, salt_bytes, 100000, 32)
+			)
+			self.fernet = _FERNET_CACHE[cache_key] = Fernet(derived_key)
 			
 		except Exception as e:
 			logging.error(f"Encryption initialization failed: {e}")
@@ -160,18 +209,24 @@ class ConfigManager:
 	def get_api_key(self, service: str) -> Optional[str]:
 		"""Get decrypted API key"""
 		env_key = f'LLEO_{service.upper()}_KEY'
-		key = os.getenv(env_key) or getattr(self.config.api_keys, service.lower())
+		key = os.getenv(env_key) or self.config.api_keys.get(service.lower())
 		if key:
+			cached = self._decrypted.get(service)
+			if cached and cached[0] == key:
+				return cached[1]
 			try:
-				return self.fernet.decrypt(key.encode()).decode()
+				value = self.fernet.decrypt(key.encode()).decode()
 			except:
-				return key
+				value = key
+			self._decrypted[service] = (key, value)
+			return value
 		return None
 
 	def set_api_key(self, service: str, key: str) -> None:
 		"""Set and encrypt API key"""
 		encrypted_key = self.fernet.encrypt(key.encode()).decode()
-		setattr(self.config.api_keys, service.lower(), encrypted_key)
+		self.config.api_keys[service.lower()] = encrypted_key
+		self._decrypted.pop(service, None)
 
 	def save_config(self, path: Path) -> None:
 		"""Save configuration securely"""
@@ -1,13 +1,26 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 from pathlib import Path
-import json
+import orjson
+import os
+import time
 from datetime import datetime
 import asyncio
+import atexit
 import logging
+import weakref
 from dataclasses import dataclass, asdict
-from dataclasses_json import dataclass_json
 
-@dataclass_json
+# Minimum seconds between session.json rewrites while updates are streaming in
+FLUSH_INTERVAL = 2.0
+
+# Open sessions, flushed by one exit hook without keeping any of them alive
+_OPEN_SESSIONS: 'weakref.WeakSet[SessionManager]' = weakref.WeakSet()
+
+@atexit.register
+def _close_open_sessions() -> None:
+    for session in list(_OPEN_SESSIONS):
+        session.close()
+
 @dataclass
 class ToolStatus:
     name: str
@@ -16,7 +29,13 @@ class ToolStatus:
     completion_time: Optional[str] = None
     output: Optional[str] = None
 
-@dataclass_json
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ToolStatus':
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
 @dataclass
 class ModuleStatus:
     name: str
@@ -27,6 +46,39 @@ class ModuleStatus:
     tools_completed: int = 0
     tools_total: int = 0
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ModuleStatus':
+        data = dict(data)
+        data['tools'] = {
+            name: ToolStatus.from_dict(tool) for name, tool in (data.get('tools') or {}).items()
+        }
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def _new_module(name: str) -> Dict[str, Any]:
+    """Fresh ModuleStatus in its stored dict form"""
+    return {
+        'name': name,
+        'status': 'pending',
+        'tools': {},
+        'start_time': None,
+        'completion_time': None,
+        'tools_completed': 0,
+        'tools_total': 0
+    }
+
+def _new_tool(name: str) -> Dict[str, Any]:
+    """Fresh ToolStatus in its stored dict form"""
+    return {
+        'name': name,
+        'status': 'pending',
+        'start_time': None,
+        'completion_time': None,
+        'output': None
+    }
+
 class SessionManager:
     def __init__(self, domain: str, output_dir: str = "output"):
         self.domain = domain
@@ -34,6 +86,15 @@ class SessionManager:
         self.domain_dir = self.base_dir / domain
         self.session_file = self.domain_dir / "session.json"
         self.logger = logging.getLogger('SessionManager')
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._ts_cache = (0, '')
+        # Bumped on every save so a slow async write can't clobber a newer one
+        self._save_gen = 0
+        self._ensured_dirs: Set[Path] = set()
+        # Debounced updates would otherwise be lost on exit, Ctrl-C or an uncaught error
+        _OPEN_SESSIONS.add(self)
         self._setup_directories()
         self.session = self.load_or_create_session()
 
@@ -51,32 +112,128 @@ class SessionManager:
         """Load existing session or create new one"""
         try:
             if self.session_file.exists():
-                return json.loads(self.session_file.read_text())
+                return orjson.loads(self.session_file.read_bytes())
         except Exception as e:
             self.logger.error(f"Error loading session: {e}")
 
+        return self._new_session()
+
+    def _new_session(self) -> Dict[str, Any]:
+        """Empty session state for the domain"""
+        now = self._now_iso()
         return {
             'domain': self.domain,
-            'start_time': datetime.now().isoformat(),
-            'last_updated': datetime.now().isoformat(),
+            'start_time': now,
+            'last_updated': now,
             'modules': {}
         }
 
     def save_session(self) -> None:
         """Save current session state"""
+        tmp_file = self.session_file.with_name(self.session_file.name + '.tmp')
+        try:
+            self._save_gen += 1
+            data = self._snapshot()
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.session_file)
+            self._last_flush = time.monotonic()
+        except Exception as e:
+            self._dirty = True
+            # Don't leave a partial write behind for every failed retry
+            tmp_file.unlink(missing_ok=True)
+            self.logger.error(f"Error saving session: {e}")
+            raise
+
+    async def save_session_async(self) -> None:
+        """Save current session state without blocking the event loop on the write"""
+        import aiofiles
+        self._save_gen += 1
+        gen = self._save_gen
+        tmp_file = self.session_file.with_name(f"{self.session_file.name}.{gen}.tmp")
         try:
-            self.session['last_updated'] = datetime.now().isoformat()
-            self.session_file.write_text(json.dumps(self.session, indent=4))
+            data = self._snapshot()
+            async with aiofiles.open(tmp_file, 'wb') as f:
+                await f.write(data)
+            if gen != self._save_gen:
+                # A newer save finished or started while this one was writing
+                os.unlink(tmp_file)
+                return
+            os.replace(tmp_file, self.session_file)
+            self._last_flush = time.monotonic()
         except Exception as e:
+            self._dirty = True
+            # Don't leave a partial write behind for every failed retry
+            tmp_file.unlink(missing_ok=True)
             self.logger.error(f"Error saving session: {e}")
             raise
 
+    def _snapshot(self) -> bytes:
+        """Serialize the session, marking it clean"""
+        self.session['last_updated'] = self._now_iso()
+        data = orjson.dumps(self.session, option=orjson.OPT_INDENT_2)
+        self._dirty = False
+        return data
+
+    def _now_iso(self) -> str:
+        """Current time as ISO 8601, reused for updates within the same millisecond"""
+        ns = time.monotonic_ns()
+        if ns - self._ts_cache[0] < 1_000_000:
+            return self._ts_cache[1]
+        stamp = datetime.now().isoformat()
+        self._ts_cache = (ns, stamp)
+        return stamp
+
+    def flush(self) -> None:
+        """Write the session out if there are unsaved changes"""
+        if self._dirty:
+            self.save_session()
+
+    def close(self) -> None:
+        """Stop the background flusher and write any pending changes"""
+        if self._flush_task and not self._flush_task.done():
+            try:
+                self._flush_task.cancel()
+            except RuntimeError:
+                # Its loop is already closed, as it is when called at exit
+                pass
+        self._flush_task = None
+        try:
+            self.flush()
+        except Exception:
+            # save_session already logged it
+            pass
+
+    def _mark_dirty(self, force: bool = False) -> None:
+        """Record a change, saving now only if forced or the last flush is stale"""
+        self._dirty = True
+        if force or time.monotonic() - self._last_flush > FLUSH_INTERVAL:
+            self.save_session()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to run the deferred flush on, so don't hold the change back
+            self.save_session()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Flush pending changes every FLUSH_INTERVAL until nothing is left to write"""
+        while self._dirty:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                if self._dirty:
+                    await self.save_session_async()
+            except Exception:
+                # save_session already logged it; retry on the next tick
+                pass
+
     def get_module_status(self, module_name: str) -> Optional[ModuleStatus]:
         """Get the status of a specific module"""
         try:
             if module_name in self.session['modules']:
-                data = self.session['modules'][module_name]
-                return ModuleStatus.from_dict(data)
+                return ModuleStatus.from_dict(self.session['modules'][module_name])
             return None
         except Exception as e:
             self.logger.error(f"Error getting module status: {e}")
@@ -86,25 +243,25 @@ class SessionManager:
         """Update the status of a specific tool"""
         try:
             if module_name not in self.session['modules']:
-                self.session['modules'][module_name] = asdict(ModuleStatus(name=module_name))
+                self.session['modules'][module_name] = _new_module(module_name)
 
             module = self.session['modules'][module_name]
-            if 'tools' not in module:
+            if module.get('tools') is None:
                 module['tools'] = {}
 
             if tool_name not in module['tools']:
-                module['tools'][tool_name] = asdict(ToolStatus(name=tool_name))
+                module['tools'][tool_name] = _new_tool(tool_name)
 
             tool = module['tools'][tool_name]
             tool['status'] = status
             if status == 'running' and not tool.get('start_time'):
-                tool['start_time'] = datetime.now().isoformat()
+                tool['start_time'] = self._now_iso()
             elif status in ['completed', 'error', 'skipped']:
-                tool['completion_time'] = datetime.now().isoformat()
+                tool['completion_time'] = self._now_iso()
                 if output:
                     tool['output'] = output
 
-            self.save_session()
+            self._mark_dirty()
         except Exception as e:
             self.logger.error(f"Error updating tool status: {e}")
 
@@ -112,16 +269,17 @@ class SessionManager:
         """Update the status of a specific module"""
         try:
             if module_name not in self.session['modules']:
-                self.session['modules'][module_name] = asdict(ModuleStatus(name=module_name))
+                self.session['modules'][module_name] = _new_module(module_name)
 
             module = self.session['modules'][module_name]
             module['status'] = status
             if status == 'running' and not module.get('start_time'):
-                module['start_time'] = datetime.now().isoformat()
+                module['start_time'] = self._now_iso()
             elif status in ['completed', 'error', 'skipped']:
-                module['completion_time'] = datetime.now().isoformat()
+                module['completion_time'] = self._now_iso()
 
-            self.save_session()
+            # Module transitions are rare and worth persisting straight away
+            self._mark_dirty(force=True)
         except Exception as e:
             self.logger.error(f"Error updating module status: {e}")
 
@@ -140,17 +298,20 @@ class SessionManager:
         """Get the directory for a specific module"""
         return self.domain_dir / module_name
 
+    def _ensure_dir(self, path: Path) -> Path:
+        """Create a directory once per run"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+        return path
+
     def get_raw_path(self, module_name: str, filename: str) -> Path:
         """Get path for raw tool output"""
-        module_dir = self.get_module_dir(module_name)
-        module_dir.mkdir(parents=True, exist_ok=True)
-        return module_dir / 'raw' / filename
+        return self._ensure_dir(self.get_module_dir(module_name) / 'raw') / filename
 
     def get_processed_path(self, module_name: str, filename: str) -> Path:
         """Get path for processed results"""
-        module_dir = self.get_module_dir(module_name)
-        module_dir.mkdir(parents=True, exist_ok=True)
-        return module_dir / 'processed' / filename
+        return self._ensure_dir(self.get_module_dir(module_name) / 'processed') / filename
 
     def has_previous_session(self) -> bool:
         """Check if there is a previous session"""
@@ -158,15 +319,16 @@ class SessionManager:
 
     def archive_session(self) -> None:
         """Archive the current session"""
+        self.flush()
         if self.session_file.exists():
             archive_dir = self.domain_dir / 'archive'
             archive_dir.mkdir(exist_ok=True)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             archive_file = archive_dir / f"session_{timestamp}.json"
             try:
-                archive_file.write_text(self.session_file.read_text())
-                self.session_file.unlink()  # Remove the current session file
-                self.session = self.load_or_create_session()  # Create new session
+                # Move the file rather than copying it; the live state starts over
+                os.rename(self.session_file, archive_file)
+                self.session = self._new_session()
             except Exception as e:
                 self.logger.error(f"Error archiving session: {e}")
                 raise
@@ -175,7 +337,9 @@ class SessionManager:
         """Restore session from file"""
         try:
             if self.session_file.exists():
-                self.session = json.loads(self.session_file.read_text())
+                self.session = orjson.loads(self.session_file.read_bytes())
+                # Unsaved changes are discarded along with the state they applied to
+                self._dirty = False
         except Exception as e:
             self.logger.error(f"Error restoring session: {e}")
             raise
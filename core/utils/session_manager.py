@@ -5,6 +5,32 @@ from pathlib import Path
 from datetime import datetime
 import aiofiles
 import logging
+import orjson
+from typing import Any, Iterator
+
+_WRITE_CHUNK_BYTES = 1 << 20
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _iter_json_chunks(results: Any) -> Iterator[bytes]:
+    """Serialize results piecewise so large result lists never become one giant string"""
+    if not isinstance(results, dict):
+        yield orjson.dumps(results, option=_DUMPS_OPTIONS)
+        return
+    yield b"{"
+    for i, (key, value) in enumerate(results.items()):
+        if i:
+            yield b","
+        yield orjson.dumps(str(key)) + b":"
+        if isinstance(value, list):
+            yield b"["
+            for j, item in enumerate(value):
+                if j:
+                    yield b","
+                yield orjson.dumps(item, option=_DUMPS_OPTIONS)
+            yield b"]"
+        else:
+            yield orjson.dumps(value, option=_DUMPS_OPTIONS)
+    yield b"}"
 
 class SessionManager:
     def __init__(self, output_dir: Path):
@@ -59,10 +85,17 @@ class SessionManager:
             for subdir in ['raw', 'processed']:
                 (module_dir / subdir).mkdir(parents=True, exist_ok=True)
             
-            # Save results to file
+            # Save results to file, streaming large lists out in bounded chunks
             results_file = module_dir / 'processed' / f"{module_name}_results.json"
-            async with aiofiles.open(results_file, 'w') as f:
-                await f.write(json.dumps(results, indent=2))
+            async with aiofiles.open(results_file, 'wb') as f:
+                buf = bytearray()
+                for chunk in _iter_json_chunks(results):
+                    buf += chunk
+                    if len(buf) >= _WRITE_CHUNK_BYTES:
+                        await f.write(bytes(buf))
+                        buf.clear()
+                if buf:
+                    await f.write(bytes(buf))
             
             # Update session data
             self.session_data['modules'][module_name] = {
@@ -97,9 +130,9 @@ class SessionManager:
             results_file = module_dir / 'processed' / f"{module_name}_results.json"
             
             if results_file.exists():
-                async with aiofiles.open(results_file) as f:
+                async with aiofiles.open(results_file, 'rb') as f:
                     content = await f.read()
-                    results = json.loads(content)
+                    results = orjson.loads(content)
                     self.module_results[module_name] = results
                     return results
                     
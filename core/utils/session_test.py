@@ -0,0 +1,148 @@
+import pytest
+import asyncio
+import gc
+import weakref
+import os
+import time
+import orjson
+from unittest.mock import patch
+from . import session as session_module
+from .session import SessionManager, _close_open_sessions
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SessionManager('example.com', str(tmp_path))
+    yield manager
+    manager.close()
+
+def read_session(manager):
+    return orjson.loads(manager.session_file.read_bytes())
+
+def leftover_tmp_files(manager):
+    return list(manager.domain_dir.glob('session.json*.tmp'))
+
+@pytest.mark.asyncio
+async def test_tool_updates_are_debounced_until_close(manager):
+    """Tool updates inside a loop are held back and written out by close()"""
+    manager.update_tool_status('recon', 'subfinder', 'running')
+    manager.update_tool_status('recon', 'amass', 'running')
+    manager.update_tool_status('recon', 'subfinder', 'completed', output='raw/subfinder.txt')
+    manager.update_tool_status('recon', 'amass', 'error')
+
+    assert not manager.session_file.exists()
+    assert manager._dirty
+    flush_task = manager._flush_task
+    assert flush_task is not None
+
+    manager.close()
+    await asyncio.sleep(0)
+    assert flush_task.cancelled()
+
+    tools = read_session(manager)['modules']['recon']['tools']
+    assert tools['subfinder']['status'] == 'completed'
+    assert tools['subfinder']['output'] == 'raw/subfinder.txt'
+    assert tools['subfinder']['start_time'] is not None
+    assert tools['subfinder']['completion_time'] is not None
+    assert tools['amass']['status'] == 'error'
+    assert tools['amass']['output'] is None
+    assert not manager._dirty
+
+    # Reloading picks up what was flushed
+    reloaded = SessionManager('example.com', str(manager.base_dir))
+    assert reloaded.get_module_status('recon').tools['amass'].status == 'error'
+
+@pytest.mark.asyncio
+async def test_flush_loop_writes_pending_updates(manager):
+    """The background flusher writes pending updates once the interval passes"""
+    with patch.object(session_module, 'FLUSH_INTERVAL', 0.05):
+        manager._last_flush = time.monotonic()
+        manager.update_tool_status('recon', 'subfinder', 'running')
+        assert not manager.session_file.exists()
+
+        await asyncio.wait_for(manager._flush_task, timeout=1)
+
+    assert read_session(manager)['modules']['recon']['tools']['subfinder']['status'] == 'running'
+    assert not manager._dirty
+    assert leftover_tmp_files(manager) == []
+
+def test_updates_without_loop_and_module_updates_save_immediately(manager):
+    """Outside a loop, and for module transitions, nothing is held back"""
+    manager.update_tool_status('recon', 'subfinder', 'running')
+    assert read_session(manager)['modules']['recon']['tools']['subfinder']['status'] == 'running'
+
+    manager.update_module_status('recon', 'completed')
+    assert read_session(manager)['modules']['recon']['status'] == 'completed'
+    assert not manager._dirty
+
+@pytest.mark.asyncio
+async def test_superseded_async_save_is_discarded(manager):
+    """An async save overtaken by a newer save doesn't replace the newer file"""
+    manager.session['modules']['old'] = {}
+    pending = asyncio.create_task(manager.save_session_async())
+    await asyncio.sleep(0)  # Snapshot taken, write in progress
+
+    manager.session['modules']['new'] = {}
+    manager.save_session()
+    await pending
+
+    assert set(read_session(manager)['modules']) == {'old', 'new'}
+    assert leftover_tmp_files(manager) == []
+    assert manager._save_gen == 2
+
+def test_failed_save_stays_dirty_for_retry(manager):
+    """A failed write leaves the changes pending so the next flush retries"""
+    real_replace = os.replace
+    with patch.object(session_module.os, 'replace', side_effect=OSError('disk full')):
+        manager.update_module_status('recon', 'running')
+    assert manager._dirty
+    assert not manager.session_file.exists()
+
+    with patch.object(session_module.os, 'replace', side_effect=real_replace):
+        manager.flush()
+    assert not manager._dirty
+    assert leftover_tmp_files(manager) == []
+    assert read_session(manager)['modules']['recon']['status'] == 'running'
+
+@pytest.mark.asyncio
+async def test_flush_loop_retries_after_failure(manager):
+    """The background flusher keeps going after a failed write"""
+    real_replace = os.replace
+    failures = [OSError('disk full')]
+    def flaky_replace(src, dst):
+        if failures:
+            raise failures.pop()
+        real_replace(src, dst)
+
+    with patch.object(session_module, 'FLUSH_INTERVAL', 0.05), \
+            patch.object(session_module.os, 'replace', side_effect=flaky_replace):
+        manager._last_flush = time.monotonic()
+        manager.update_tool_status('recon', 'subfinder', 'running')
+        await asyncio.wait_for(manager._flush_task, timeout=1)
+
+    assert failures == []
+    assert not manager._dirty
+    assert read_session(manager)['modules']['recon']['tools']['subfinder']['status'] == 'running'
+    assert leftover_tmp_files(manager) == []
+
+def test_exit_hook_flushes_without_keeping_sessions_alive(tmp_path):
+    """Open sessions are flushed at exit, but only while something still holds them"""
+    manager = SessionManager('example.com', str(tmp_path))
+    manager.session['modules']['recon'] = {}
+    manager._dirty = True
+    _close_open_sessions()
+    assert 'recon' in read_session(manager)['modules']
+
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
+
+def test_restore_discards_pending_changes(manager):
+    """A restored session isn't overwritten by the changes it replaced"""
+    manager.update_module_status('recon', 'completed')
+    manager.session['modules']['recon']['status'] = 'running'
+    manager._dirty = True
+
+    manager.restore_session()
+    _close_open_sessions()
+    assert read_session(manager)['modules']['recon']['status'] == 'completed'
@@ -7,6 +7,8 @@ import json
 from datetime import datetime
 from dataclasses import asdict
 import re
+import shutil
+from functools import lru_cache
 
 @dataclass
 class ToolInfo:
@@ -375,17 +377,15 @@ class ToolChecker:
             self.logger.error(f"Error getting {tool} version: {e}")
             return None
 
+@lru_cache(maxsize=None)
+def tool_path(tool_name: str) -> Optional[str]:
+    """Resolve a tool on PATH once per process without forking `which`"""
+    return shutil.which(tool_name)
+
 async def check_tool_exists(tool_name: str, logger: Optional[logging.Logger] = None) -> bool:
     """Check if a tool is installed"""
     try:
-        process = await asyncio.create_subprocess_exec(
-            'which',
-            tool_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        await process.communicate()
-        return process.returncode == 0
+        return tool_path(tool_name) is not None
     except Exception as e:
         if logger:
             logger.error(f"Error checking tool existence: {e}")
@@ -4,7 +4,23 @@ import asyncio
 import logging
 from dataclasses import dataclass
 import json
+import subprocess
 from .rate_limiter import RateLimiter
+from .tool_checker import tool_path
+
+def check_tool_exists(tool_name: str) -> bool:
+    """Check if a tool is installed, using the cached PATH lookup"""
+    return tool_path(tool_name) is not None
+
+def run_tool(cmd: List[str], capture_output: bool = False) -> Optional[str]:
+    """Run a tool, raising CalledProcessError with its stderr on failure and optionally returning its stdout"""
+    # Unless the caller wants stdout, discard it rather than inheriting the terminal
+    stdout = subprocess.PIPE if capture_output else subprocess.DEVNULL
+    with subprocess.Popen(cmd, stdout=stdout, stderr=subprocess.PIPE) as proc:
+        out, stderr = proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr.decode(errors='replace'))
+    return out.decode(errors='replace') if capture_output else None
 
 @dataclass
 class ToolResult:
@@ -84,18 +100,7 @@ class ToolExecutor:
 
     async def check_tool_exists(self, tool_name: str) -> bool:
         """Check if a tool is installed"""
-        try:
-            process = await asyncio.create_subprocess_exec(
-                'which',
-                tool_name,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-            return process.returncode == 0
-        except Exception as e:
-            self.logger.error(f"Error checking tool existence: {e}")
-            return False
+        return check_tool_exists(tool_name)
 
     async def run_with_retry(
         self,
@@ -26,6 +26,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('-o', '--output', help='Output directory')
     parser.add_argument('-c', '--config', help='Custom config file')
     parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached tool results and rescan')
     return parser.parse_args()
 
 async def run_framework(framework: Framework) -> None:
@@ -51,9 +52,14 @@ def main() -> None:
         # Create framework instance
         framework = Framework(args)
         
-        # Run framework
-        import asyncio
-        asyncio.run(run_framework(framework))
+        # Run framework, on uvloop's libuv event loop when it is installed
+        try:
+            import uvloop
+        except ImportError:
+            import asyncio
+            asyncio.run(run_framework(framework))
+        else:
+            uvloop.run(run_framework(framework))
         
     except KeyboardInterrupt:
         print("\nReceived keyboard interrupt, exiting...")